@@ -0,0 +1,86 @@
+"""
+Startup benchmark for the prompt cache and qna_list sync.
+
+Generates a large qnas_cache + qna_list in a temp folder and times:
+  - load_prompt_cache (snapshot + log replay + index build)
+  - get_changed_qna_list for a new conversation (question lookups + invalidations)
+against the previous full-key-scan implementation.
+
+Run: python benchmarks/bench_cache_startup.py [cache_size] [qna_list_size]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import utils.cache_manager as cache_manager
+import utils.user_data_manager as user_data_manager
+
+
+def _write_fixtures(folder, cache_size, qna_size):
+    cache = {}
+    for i in range(cache_size):
+        if i % 2:
+            cache[f"text::Question number {i}?"] = str(i)
+        else:
+            cache[f"select::Question number {i}?::['Yes', 'No']"] = "Yes"
+    cache_file = os.path.join(folder, "qnas_cache.json")
+    with open(cache_file, "w") as f:
+        json.dump(cache, f, indent=4)
+    qna_file = os.path.join(folder, "qna_list.txt")
+    with open(qna_file, "w") as f:
+        f.write("header\n" * user_data_manager.QNA_LIST_HEADER_LINES)
+        for i in range(qna_size):
+            f.write(f"Question number {i * 3}?: answer {i}\n")
+    return cache_file, qna_file
+
+
+def _legacy_changed_qna_list(cache, qna_list):
+    """Previous behaviour: rebuild the qna view and scan every key per changed question."""
+    changed = {}
+    qna_cache = {}
+    for key, val in cache.items():
+        qna_cache[key.split("::")[1]] = val
+    for user_q, user_a in qna_list.items():
+        if user_a and user_a != qna_cache.get(user_q):
+            changed[user_q] = user_a
+            for key in list(cache.keys()):
+                if key.split("::")[1] == user_q:
+                    del cache[key]
+    return changed
+
+
+def _timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<40} {time.perf_counter() - start:8.3f}s")
+    return result
+
+
+def main(cache_size=50_000, qna_size=1_000):
+    with tempfile.TemporaryDirectory() as folder:
+        cache_file, qna_file = _write_fixtures(folder, cache_size, qna_size)
+        cache_manager.CACHE_FILE = cache_file
+        cache_manager.CACHE_LOG_FILE = os.path.join(folder, "qnas_cache.log")
+        cache_manager.CACHE_META_FILE = os.path.join(folder, "qnas_cache_meta.json")
+        cache_manager.CACHE_META_LOG_FILE = os.path.join(folder, "qnas_cache_meta.log")
+        cache_manager.CACHE_MAX_ENTRIES = {}
+        user_data_manager.QNA_LIST_FILE = qna_file
+        print(f"cache entries: {cache_size}, qna_list entries: {qna_size}")
+
+        _timed("load_prompt_cache", cache_manager.load_prompt_cache)
+        _, qna_list = _timed("read_qna_list_qnas", user_data_manager.read_qna_list_qnas)
+        user_data_manager._qna_list = qna_list
+
+        legacy_cache = dict(cache_manager.get_full_cache())
+        legacy = _timed("legacy get_changed_qna_list", lambda: _legacy_changed_qna_list(legacy_cache, qna_list))
+        changed = _timed("indexed get_changed_qna_list", lambda: user_data_manager.get_changed_qna_list({}))
+        assert set(changed) == set(legacy)
+        assert len(cache_manager.get_full_cache()) == len(legacy_cache)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
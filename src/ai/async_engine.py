@@ -0,0 +1,92 @@
+"""
+Asyncio engine for OpenAI requests: one AsyncOpenAI client over a pooled HTTP connection, running on a
+background event loop with at most AI_MAX_CONCURRENCY requests in flight and a timeout per call type.
+
+Blocking callers use request()/upload_file(); code that overlaps lookups passes the coroutines to submit()
+and waits on the returned futures. Coroutines must run on the engine loop (through submit), not on another one.
+"""
+import asyncio
+import atexit
+import os
+import threading
+
+from config import AI_DEFAULT_TIMEOUT, AI_MAX_CONCURRENCY, AI_TIMEOUTS, get_openai_key
+
+_loop = None
+_client = None
+_semaphore = None
+_start_lock = threading.Lock()
+
+
+def _timeout(call_type):
+    return AI_TIMEOUTS.get(call_type, AI_DEFAULT_TIMEOUT)
+
+
+def _start():
+    global _loop, _client, _semaphore
+    import httpx
+    from openai import AsyncOpenAI
+
+    api_key = get_openai_key()
+    if not api_key:
+        raise RuntimeError("OpenAI API key is empty or not configured")
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="ai-engine", daemon=True).start()
+
+    async def setup():
+        limits = httpx.Limits(max_connections=AI_MAX_CONCURRENCY, max_keepalive_connections=AI_MAX_CONCURRENCY)
+        client = AsyncOpenAI(api_key=api_key, http_client=httpx.AsyncClient(limits=limits))
+        return client, asyncio.Semaphore(AI_MAX_CONCURRENCY)
+
+    _client, _semaphore = asyncio.run_coroutine_threadsafe(setup(), loop).result()
+    _loop = loop
+    atexit.register(_stop)
+
+
+def _ensure_started():
+    if _loop is None:
+        with _start_lock:
+            if _loop is None:
+                _start()
+
+
+def _stop():
+    try:
+        asyncio.run_coroutine_threadsafe(_client.close(), _loop).result(timeout=5)
+    except Exception:
+        pass
+    _loop.call_soon_threadsafe(_loop.stop)
+
+
+async def create_response(call_type, **kwargs):
+    """client.responses.create(**kwargs) with the call type's timeout, once a concurrency slot is free."""
+    async with _semaphore:
+        return await _client.responses.create(timeout=_timeout(call_type), **kwargs)
+
+
+async def create_file(call_type, **kwargs):
+    async with _semaphore:
+        return await _client.files.create(timeout=_timeout(call_type), **kwargs)
+
+
+def submit(coroutine):
+    """Schedule a coroutine of this module on the engine loop. Returns a concurrent.futures.Future."""
+    try:
+        _ensure_started()
+    except Exception:
+        coroutine.close()
+        raise
+    return asyncio.run_coroutine_threadsafe(coroutine, _loop)
+
+
+def request(call_type, **kwargs):
+    """Blocking responses.create through the engine."""
+    return submit(create_response(call_type, **kwargs)).result()
+
+
+def upload_file(file_path, purpose, call_type="upload"):
+    """Blocking files.create of a local file through the engine."""
+    with open(file_path, "rb") as fh:
+        content = fh.read()
+    upload = (os.path.basename(file_path), content)  # the file name tells the API the file type
+    return submit(create_file(call_type, file=upload, purpose=purpose)).result()
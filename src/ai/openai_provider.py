@@ -1,20 +1,36 @@
 import json
 import os.path
 import sys
+import threading
 
-from openai import OpenAI
-
-from config import get_openai_key, QNA_LIST_FILE, TRAINED_DATA_FILE, OPENAI_MODEL, INSTRUCTIONS_FILE
+from ai.async_engine import request, upload_file
+from config import QNA_LIST_FILE, TRAINED_DATA_FILE, OPENAI_MODEL, INSTRUCTIONS_FILE
 from utils.cache_manager import clear_cache
-from utils.common_utils import last_modified_iso, transform_to_object
+from utils.candidate_profile import PROFILE_STRUCTURE, ensure_candidate_profile
+from utils.common_utils import file_sha256, last_modified_iso, transform_to_object, extract_valid_json
+from utils.relevancy_cache import cache_relevancy, get_cached_relevancy
 from utils.run_data_manager import get_run_data, update_run_data_udc
-from utils.txt_utils import append_txt_records
 from utils.user_data_manager import get_changed_qna_list, remove_from_qna_list, get_resume_file, is_new_resume, \
-    get_ai_instructions_data, clear_ai_instructions_data
+    get_ai_instructions_data, clear_ai_instructions_data, get_qna_list, get_resume_upload, record_resume_upload
+from utils.write_behind import append_lines
+
+
+
+class RunContext:
+    """Provider state for this run. The user detail chat is set up by sync_user_details() (or on first use), not at
+    import."""
+
+    def __init__(self):
+        self.user_detail_chat_id = None
+        self.current_job_chat_id = None
+        self.pending_job_details = None  # job details to start the job conversation with when first needed
+        self.ai_calls = 0  # responses requested in this run, for analytics
+        self.lock = threading.Lock()
+        self.init_lock = threading.Lock()
+        self.job_lock = threading.Lock()
 
-_openai_client = None
-_user_detail_chat_id = None
-_current_job_chat_id = None
+
+_context = RunContext()
 
 BUTTON_JSON = {
     "label": "<str: label of button>",
@@ -87,20 +103,64 @@ parse_form_tools = [
 ]
 
 
-def _get_openai_client():
-    """Returns a cached OpenAI client using the API key from config."""
-    global _openai_client
-    if _openai_client:
-        return _openai_client
+def _create_response(call_type, **kwargs):
+    """Blocking responses.create through the async engine, with the timeout of call_type (AI_TIMEOUTS)."""
+    with _context.lock:
+        _context.ai_calls += 1
+    return request(call_type, **kwargs)
+
+
+def get_ai_call_count():
+    """Number of AI requests made so far in this run."""
+    return _context.ai_calls
 
-    try:
-        openai_api_key = get_openai_key()
-        if not openai_api_key:
-            raise RuntimeError("OpenAI API key is empty or not configured")
-        _openai_client = OpenAI(api_key=openai_api_key)
-        return _openai_client
-    except Exception as e:
-        raise RuntimeError(f"Error getting OpenAI API key: {e}")
+
+def ai_error_kind(error):
+    """
+    "rate_limit" or "api" for errors raised by the OpenAI SDK, otherwise None.
+    Lets callers handle them without importing the SDK (it is only loaded once a request was made).
+    """
+    openai = sys.modules.get("openai")
+    if openai is None:
+        return None
+    if isinstance(error, openai.RateLimitError):
+        return "rate_limit"
+    if isinstance(error, openai.OpenAIError):
+        return "api"
+    return None
+
+
+def _user_detail_chat_id():
+    """The user detail conversation id, uploading the resume and syncing qna_list/instructions on first use."""
+    if _context.user_detail_chat_id is None:
+        with _context.init_lock:
+            if _context.user_detail_chat_id is None:
+                _initialize()
+    return _context.user_detail_chat_id
+
+
+def sync_user_details():
+    """Upload the resume, sync qna_list/instructions and build the candidate profile now, on the calling thread."""
+    _user_detail_chat_id()
+
+
+def _job_chat_id():
+    """The current job conversation id, sending the pending job details first if it was started lazily."""
+    if _context.pending_job_details is not None:
+        with _context.job_lock:
+            job_details = _context.pending_job_details
+            if job_details is not None:
+                print("Sending the job details to AI...")
+                response = _create_response(
+                    "context",
+                    model=OPENAI_MODEL,
+                    input=("Here are the job details I am applying for. Use them with my details for my next "
+                           f"questions about this job. Reply OK only.\n\nJOB_DETAILS:\n{job_details}"),
+                    previous_response_id=_user_detail_chat_id()
+                )
+                _context.current_job_chat_id = response.id
+                _context.pending_job_details = None
+    return _context.current_job_chat_id
 
 
 def parse_form(html: str):
@@ -108,8 +168,8 @@ def parse_form(html: str):
     Sends a prompt to OpenAI's Responses API and returns the parsed fields.
     """
     print("Sending prompt to OpenAI...")
-    client = _get_openai_client()
-    response = client.responses.create(
+    response = _create_response(
+        "parse",
         model=OPENAI_MODEL,
         input=[
             {
@@ -144,12 +204,13 @@ def parse_hiring_team(job_detail_html):
             }
         ]
     }
-    client = _get_openai_client()
-    response = client.responses.create(
+    response = _create_response(
+        "parse",
         model=OPENAI_MODEL,
         input=f"""
             Extract "Meet the hiring team" details from the HTML below and output JSON following this structure. Return {{}} if not find "Meet the hiring team" section.
             {json.dumps(hiring_team_structure, indent=2)}
+            Build selectors from the id, aria-label, name or data-ja-id attributes in the HTML.
             Return valid JSON only. HTML:
             {job_detail_html}
             """
@@ -175,13 +236,14 @@ def parse_profile(profile_detail_html):
             ]
         }
     }
-    client = _get_openai_client()
-    response = client.responses.create(
+    response = _create_response(
+        "parse",
         model=OPENAI_MODEL,
         input=f"""
             Extract the person details and available control buttons from the HTML below and output JSON following this structure. Return {{}} if not none.
             Usually, if a valid 'Connect' button found that means they are not connected yet.
             {json.dumps(person_detail_and_controls_structure, indent=2)}
+            Build selectors from the id, aria-label, name or data-ja-id attributes in the HTML.
             Return valid JSON only. HTML:
             {profile_detail_html}
             """
@@ -217,12 +279,13 @@ def parse_message_form(msg_form_html):
         }
 
     }
-    client = _get_openai_client()
-    response = client.responses.create(
+    response = _create_response(
+        "parse",
         model=OPENAI_MODEL,
         input=f"""
             Parse message form details from the HTML below and output JSON following this structure, return {{}} if not find message form:
             {json.dumps(msg_form_structure, indent=2)}
+            Build selectors from the id, aria-label, name or data-ja-id attributes in the HTML.
             Return valid JSON only. HTML:
             {msg_form_html}
             """
@@ -235,8 +298,8 @@ def start_conversation(instruction):
     Starts a conversation with OpenAI's Responses API and returns the conversation ID.
     """
     print("Starting conversation with OpenAI...")
-    client = _get_openai_client()
-    response = client.responses.create(
+    response = _create_response(
+        "context",
         model=OPENAI_MODEL,
         input=instruction,
     )
@@ -244,8 +307,17 @@ def start_conversation(instruction):
 
 
 def set_current_job_chat_id(chat_id):
-    global _current_job_chat_id
-    _current_job_chat_id = chat_id
+    _context.current_job_chat_id = chat_id
+    _context.pending_job_details = None
+
+
+def start_current_job_chat_lazily(job_details):
+    """
+    Make job_details the context of the following questions without an AI request now. The job
+    conversation is started with the first question that needs AI, so jobs answered from cache cost none.
+    """
+    _context.current_job_chat_id = None
+    _context.pending_job_details = job_details
 
 
 def ask_text_from_ai(question, validation=None):
@@ -255,11 +327,11 @@ def ask_text_from_ai(question, validation=None):
     if validation:
         question = f"{question.strip()}{validation}"
     print("Getting answer from OpenAI...")
-    client = _get_openai_client()
-    response = client.responses.create(
+    response = _create_response(
+        "answer",
         model=OPENAI_MODEL,
         input=question,
-        previous_response_id=_current_job_chat_id or _user_detail_chat_id
+        previous_response_id=_job_chat_id() or _user_detail_chat_id()
     )
     return response.output_text
 
@@ -267,17 +339,75 @@ def ask_text_from_ai(question, validation=None):
 def ask_select_from_ai(question, options):
     """Call OpenAI to choose an option."""
     print("Getting select answer from OpenAI...")
-    client = _get_openai_client()
-    response = client.responses.create(
+    response = _create_response(
+        "answer",
         model=OPENAI_MODEL,
         input=f"""Select an option for: {question} 
                 Out of these options: 
                 {options} """,
-        previous_response_id=_current_job_chat_id or _user_detail_chat_id
+        previous_response_id=_job_chat_id() or _user_detail_chat_id()
     )
     return response.output_text
 
 
+def ask_answers_batch_from_ai(questions):
+    """
+    Answer several form questions with one request on the current job conversation.
+    :param questions: list of {"id", "type": "text"|"select", "question", "validation"?, "options"?}
+    :return: dict {id: answer}, {} if the response could not be parsed.
+    """
+    print(f"Getting {len(questions)} answers from OpenAI in one batch...")
+    items = []
+    for q in questions:
+        item = {"id": q["id"], "question": q["question"]}
+        if q.get("validation"):
+            item["validation"] = q["validation"]
+        if q["type"] == "select":
+            item["options"] = q["options"]
+        items.append(item)
+    prompt = (
+        "Answer each of these job application form questions.\n"
+        "Return ONLY a JSON object mapping every question id to its answer string, no extra text:\n"
+        '{"<id>": "<answer>", ...}\n'
+        "Guidelines:\n"
+        "- If a question has options, the answer must be exactly one of its options.\n"
+        "- Follow the validation of a question if given.\n"
+        "- If information is missing, unclear, or not applicable, answer ''.\n\n"
+        f"QUESTIONS:\n{json.dumps(items, indent=2)}"
+    )
+    response = _create_response(
+        "batch",
+        model=OPENAI_MODEL,
+        input=prompt,
+        previous_response_id=_job_chat_id() or _user_detail_chat_id()
+    )
+    answers = transform_to_object(extract_valid_json(response.output_text or ""))
+    return answers if isinstance(answers, dict) else {}
+
+
+def ask_candidate_profile_from_ai():
+    """
+    Compile the candidate's resume and answered questions into a structured profile (PROFILE_STRUCTURE).
+    :return: profile dict, or None if the response could not be parsed.
+    """
+    print("Getting candidate profile from OpenAI...")
+    prompt = (
+        "Compile my details from my resume and the questions I answered into this JSON structure.\n"
+        "Return ONLY the JSON object, no extra text. Use null for anything not known; do not guess.\n"
+        "List every skill, tool and technology with the years of experience I have with it.\n\n"
+        f"STRUCTURE:\n{json.dumps(PROFILE_STRUCTURE, indent=2)}\n\n"
+        f"ANSWERED QUESTIONS:\n{json.dumps(get_qna_list(), indent=2)}"
+    )
+    response = _create_response(
+        "profile",
+        model=OPENAI_MODEL,
+        input=prompt,
+        previous_response_id=_user_detail_chat_id()
+    )
+    profile = transform_to_object(extract_valid_json(response.output_text or ""))
+    return profile if isinstance(profile, dict) else None
+
+
 def ask_recruiter_message_from_ai(recruiter_name: str) -> dict:
     """
     Request a recruiter outreach message from the OpenAI model.
@@ -304,11 +434,11 @@ def ask_recruiter_message_from_ai(recruiter_name: str) -> dict:
         '''
 
     try:
-        client = _get_openai_client()
-        response = client.responses.create(
+        response = _create_response(
+            "message",
             model=OPENAI_MODEL,
             input=prompt,
-            previous_response_id=_current_job_chat_id or _user_detail_chat_id,
+            previous_response_id=_job_chat_id() or _user_detail_chat_id(),
         )
 
         return transform_to_object(response.output_text)
@@ -325,23 +455,23 @@ def ask_recruiter_connect_note_from_ai(recruiter_name: str) -> str:
     :return: string message
     """
     print("Getting recruiter connection note from OpenAI...")
-    client = _get_openai_client()
-    response = client.responses.create(
+    response = _create_response(
+        "message",
         model=OPENAI_MODEL,
         input=f"""
                 I have applied the role and sending connection request to the recruiter. 
                 Write a LinkedIn connection request note for recruiter: {recruiter_name}, use first name. 
                 Keep the note within 300 characters.
             """,
-        previous_response_id=_current_job_chat_id or _user_detail_chat_id,
+        previous_response_id=_job_chat_id() or _user_detail_chat_id(),
     )
     return response.output_text.strip()
 
 def ask_linkedin_connection_note_from_ai(job_title, company_name, recruiter_name):
     """Call OpenAI to generate a LinkedIn connection note."""
     print("Getting LinkedIn connection note from OpenAI...")
-    client = _get_openai_client()
-    response = client.responses.create(
+    response = _create_response(
+        "message",
         model=OPENAI_MODEL,
         input=f"""Write a LinkedIn connection request note for recruiter: {recruiter_name} for job {job_title} at {company_name}""",
     )
@@ -351,9 +481,7 @@ def ask_linkedin_connection_note_from_ai(job_title, company_name, recruiter_name
 def upload_resume_and_start_chat(file_path):
     """ Uploads resume file and starts a new conversation. Returns the conversation ID. """
     print("Uploading resume and starting new conversation...")
-    client = _get_openai_client()
-    with open(file_path, "rb") as fh:
-        uploaded_file = client.files.create(file=fh, purpose="user_data")
+    uploaded_file = upload_file(file_path, purpose="user_data")
 
     input_content = [{
         "role": "user",
@@ -378,16 +506,19 @@ def upload_resume_and_start_chat(file_path):
         ]
     }]
 
-    response = client.responses.create(
+    response = _create_response(
+        "context",
         model=OPENAI_MODEL,
         input=input_content
     )
     resume =  {
         "file_path": file_path,
-        "last_modified": last_modified_iso(file_path)
+        "last_modified": last_modified_iso(file_path),
+        "sha256": file_sha256(file_path),
+        "file_id": uploaded_file.id
     }
     print("Uploaded resume and started new conversation with AI feedback: ", response.output_text)
-    append_txt_records(TRAINED_DATA_FILE, f"Resume updated: {file_path}")
+    append_lines(TRAINED_DATA_FILE, f"Resume updated: {file_path}")
     update_run_data_udc(response.id, "resume", resume)
     return response.id
 
@@ -402,18 +533,19 @@ def send_qna_list_to_chat(previous_chat_id, qnas_dict):
     prompt = "Here are some updated details, please update your information accordingly and respond based on updated data for future questions."
     payload = f"{prompt}\n" + "\n - ".join(qnas)
     try:
-        client = _get_openai_client()
-        response = client.responses.create(
+        response = _create_response(
+            "context",
             model=OPENAI_MODEL,
             input=payload,
             previous_response_id=previous_chat_id
         )
         run_data_qna_list = {
             "file_path": os.path.join(QNA_LIST_FILE),
-            "last_modified": last_modified_iso(QNA_LIST_FILE)
+            "last_modified": last_modified_iso(QNA_LIST_FILE),
+            "sha256": file_sha256(QNA_LIST_FILE)
         }
         print("qna_list updated with AI feedback: ", response.output_text)
-        append_txt_records(TRAINED_DATA_FILE, qnas)
+        append_lines(TRAINED_DATA_FILE, qnas)
         update_run_data_udc(response.id, "qna_list", run_data_qna_list)
         return response.id
     except Exception as e:
@@ -429,8 +561,8 @@ def send_instruction_to_chat(previous_chat_id, instructions):
     print("Updating AI context with instructions.")
     payload = "\n".join(instructions)
     try:
-        client = _get_openai_client()
-        response = client.responses.create(
+        response = _create_response(
+            "context",
             model=OPENAI_MODEL,
             input=payload,
             previous_response_id=previous_chat_id
@@ -440,18 +572,20 @@ def send_instruction_to_chat(previous_chat_id, instructions):
             "last_modified": last_modified_iso(INSTRUCTIONS_FILE)
         }
         print("instructions updated with AI feedback: ", response.output_text)
-        append_txt_records(TRAINED_DATA_FILE, instructions)
+        append_lines(TRAINED_DATA_FILE, instructions)
         update_run_data_udc(response.id, "instructions", run_data_instructions)
         return response.id
     except Exception as e:
         print(f"Failed to send qna_list to chat. {e}")
         raise e
 
-def start_current_job_query_chat(job_details):
+def start_current_job_query_chat(job_details, job_id=None):
     """
     Send Job Details into the existing user-details conversation so AI can:
     - evaluate job–candidate relevancy based on job details + resume + other info
     - continue using this same conversation for future queries about this job
+    With a LinkedIn job_id, an evaluation of the same job description, resume and model done before is
+    reused together with its conversation.
 
     Returns:
         dict | None: Parsed relevancy status object:
@@ -461,12 +595,18 @@ def start_current_job_query_chat(job_details):
             }
         or None on error.
     """
-    if not _user_detail_chat_id:
-        print("No user_detail_chat_id found.")
-        return None
     if not job_details:
         print("No job_details found.")
         return None
+    cached = get_cached_relevancy(job_id, job_details)
+    if cached:
+        print("Reusing the relevancy evaluated before for this job.")
+        relevancy_status, chat_id = cached
+        set_current_job_chat_id(chat_id)
+        return relevancy_status
+    if not _user_detail_chat_id():
+        print("No user_detail_chat_id found.")
+        return None
     print("Understanding the job details...")
     payload = (
         "Here are the job details I am applying for. Based on these job details and the previously provided "
@@ -484,16 +624,17 @@ def start_current_job_query_chat(job_details):
         f"JOB_DETAILS:\n{job_details}"
     )
     try:
-        client = _get_openai_client()
-        response = client.responses.create(
+        response = _create_response(
+            "relevancy",
             model=OPENAI_MODEL,
             input=payload,
-            previous_response_id=_user_detail_chat_id
+            previous_response_id=_user_detail_chat_id()
         )
 
         set_current_job_chat_id(response.id)
         raw_output = (response.output_text or "").strip()
         relevancy_status = transform_to_object(raw_output)
+        cache_relevancy(job_id, job_details, relevancy_status, response.id)
         return relevancy_status
     except Exception as e:
         print(f"Failed to send job_details to chat. {e}")
@@ -501,8 +642,9 @@ def start_current_job_query_chat(job_details):
 
 def _get_user_detail_conv_id():
     """
-    Return an existing user-detail conversation id if resume file metadata matches,
-    otherwise upload resume and start a new conversation, persisting metadata.
+    Return (conversation id, qna_list changed): an existing user-detail conversation id if the resume content
+    is unchanged, otherwise resume the conversation of a previous upload of the same content, or upload it and
+    start a new conversation. qna_list changed is True if the user edited answers since the last sync.
 
     Also handles qna_list.txt qnas:
     - If resume is new -> create new conversation and then send ALL valid qnas (if any).
@@ -521,12 +663,21 @@ def _get_user_detail_conv_id():
     user_detail_chat_id = user_detail_chat.get("chat_id")
     print(f"Existing user_detail_chat_id: {user_detail_chat_id}")
 
+    resume_sha = file_sha256(resume_path)
     resume_changed = False
-    if not user_detail_chat_id or (resume_changed := is_new_resume(resume_path)):
+    if not user_detail_chat_id or (resume_changed := is_new_resume(resume_path, resume_sha)):
         print("Resume file has changed or no existing conversation found.")
-        user_detail_chat_id = upload_resume_and_start_chat(resume_path)
+        previous_upload = get_resume_upload(resume_sha)
+        if previous_upload:
+            print(f"Resume was uploaded before as {previous_upload['file_id']}, reusing its conversation.")
+            user_detail_chat_id = previous_upload["chat_id"]
+            update_run_data_udc(user_detail_chat_id, "resume", dict(previous_upload["resume"], file_path=resume_path))
+        else:
+            user_detail_chat_id = upload_resume_and_start_chat(resume_path)
         print(f"New user_detail_chat_id: {user_detail_chat_id}")
         clear_cache()
+    elif "sha256" not in user_detail_chat.get("resume", {}):
+        update_run_data_udc(user_detail_chat_id, "resume", dict(user_detail_chat["resume"], sha256=resume_sha))
 
     changed_qnas = get_changed_qna_list(user_detail_chat, resume_changed)
     if changed_qnas:
@@ -542,7 +693,8 @@ def _get_user_detail_conv_id():
         print(f"New user_detail_chat_id: {user_detail_chat_id}")
         clear_ai_instructions_data()
 
-    return user_detail_chat_id
+    record_resume_upload(resume_sha, user_detail_chat_id, get_run_data()[key]["resume"])
+    return user_detail_chat_id, bool(changed_qnas)
 
 
 def ask_openai(prompt: str):
@@ -550,8 +702,8 @@ def ask_openai(prompt: str):
     Sends a prompt to OpenAI's Responses API and returns the raw output text.
     """
     print("Sending prompt to OpenAI...")
-    client = _get_openai_client()
-    response = client.responses.create(
+    response = _create_response(
+        "default",
         model=OPENAI_MODEL,
         input=prompt
     )
@@ -559,10 +711,9 @@ def ask_openai(prompt: str):
 
 def _initialize():
     print("Initializing OpenAI provider...")
-    global _user_detail_chat_id
-    _user_detail_chat_id = _get_user_detail_conv_id()
-
-_initialize()
+    _context.user_detail_chat_id, qna_list_changed = _get_user_detail_conv_id()
+    # answers the user edited in qna_list must reach the profile rules, which run before the cache and AI
+    ensure_candidate_profile(get_resume_file(), ask_candidate_profile_from_ai, rebuild=qna_list_changed)
 
 if __name__ == "__main__":
     response = ask_openai("Write a one-sentence bedtime story about a unicorn.")
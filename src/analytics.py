@@ -0,0 +1,189 @@
+"""
+Run analytics over the job ledger: per-run funnel, outcome breakdown, time per phase and AI calls.
+The ledger is streamed once into per-column arrays, so memory stays small on hundreds of
+thousands of records. Writes a markdown report and a per-run CSV to OUTPUT_DIR.
+
+Usage: python analytics.py [--since YYYY-MM-DD] [--out <dir>]
+"""
+import argparse
+import datetime
+from array import array
+from collections import Counter
+from pathlib import Path
+
+from config import OUTPUT_DIR
+from utils.application_ledger import iter_job_records
+from utils.csv_utils import export_csv
+from utils.seen_jobs import job_outcome
+
+PHASES = ["extract", "relevancy", "form", "recruiter", "total"]
+RUN_COLUMNS = ["run_id", "started", "ended", "processed", "relevant", "form_attempted", "applied",
+               "apply_rate", "applied_per_hour", "ai_calls", "ai_calls_per_application", "total_seconds"]
+
+
+class _Run:
+    __slots__ = ("started", "ended", "processed", "relevant", "form_attempted", "applied", "ai_calls", "seconds")
+
+    def __init__(self, recorded_at):
+        self.started = self.ended = recorded_at
+        self.processed = self.relevant = self.form_attempted = self.applied = self.ai_calls = 0
+        self.seconds = 0.0
+
+
+class Aggregates:
+    """Single pass accumulator: counters per run and outcome, one float array per phase."""
+
+    def __init__(self):
+        self.runs = {}
+        self.outcomes = Counter()
+        self.statuses = Counter()
+        self.relevancy = Counter()  # bucket of 10 -> jobs
+        self.failed_companies = Counter()
+        self.phases = {phase: array("d") for phase in PHASES}
+        self.ai_calls = array("l")
+        self.records = 0
+
+    def add(self, record):
+        self.records += 1
+        recorded_at = record.get("recorded_at", "")
+        run = self.runs.get(record.get("run_id") or "-")
+        if run is None:
+            run = self.runs[record.get("run_id") or "-"] = _Run(recorded_at)
+        run.ended = max(run.ended, recorded_at)
+        run.processed += 1
+
+        timings = record.get("timings") or {}
+        for phase, values in self.phases.items():
+            if phase in timings:
+                values.append(timings[phase])
+        if "form" in timings:
+            run.form_attempted += 1
+        run.seconds += timings.get("total", 0)
+        if "ai_calls" in record:
+            self.ai_calls.append(record["ai_calls"])
+            run.ai_calls += record["ai_calls"]
+
+        relevancy = record.get("relevancy")
+        if relevancy is not None:
+            self.relevancy[min(int(relevancy) // 10 * 10, 90)] += 1
+        applied, status = record.get("applied"), record.get("status") or ""
+        outcome = job_outcome(applied, status)
+        self.outcomes[outcome] += 1
+        if relevancy is not None and outcome != "not_relevant":
+            run.relevant += 1
+        if applied:
+            run.applied += 1
+        else:
+            self.statuses[status] += 1
+            if "form" in timings and record.get("company"):
+                self.failed_companies[record["company"]] += 1
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    return sorted_values[min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)]
+
+
+def _hours(started, ended):
+    try:
+        span = datetime.datetime.fromisoformat(ended) - datetime.datetime.fromisoformat(started)
+    except ValueError:
+        return 0
+    return span.total_seconds() / 3600
+
+
+def run_rows(aggregates):
+    for run_id, run in aggregates.runs.items():
+        hours = _hours(run.started, run.ended)
+        yield {
+            "run_id": run_id,
+            "started": run.started,
+            "ended": run.ended,
+            "processed": run.processed,
+            "relevant": run.relevant,
+            "form_attempted": run.form_attempted,
+            "applied": run.applied,
+            "apply_rate": round(run.applied / run.processed, 3),
+            "applied_per_hour": round(run.applied / hours, 1) if hours else "",
+            "ai_calls": run.ai_calls,
+            "ai_calls_per_application": round(run.ai_calls / run.applied, 1) if run.applied else "",
+            "total_seconds": round(run.seconds, 1),
+        }
+
+
+def _table(header, rows):
+    lines = ["| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+    lines += ["| " + " | ".join("" if v is None else str(v) for v in row) + " |" for row in rows]
+    return "\n".join(lines)
+
+
+def render_report(aggregates, runs):
+    applied = aggregates.outcomes["applied"]
+    lines = ["# JobApplier.AI run report",
+             f"Generated {datetime.datetime.now().isoformat(timespec='seconds')} from "
+             f"{aggregates.records} job records in {len(runs)} runs.", ""]
+
+    lines += ["## Runs", _table(["Run", "Started", "Processed", "Relevant", "Form", "Applied", "Applied/hour",
+                                 "AI calls/application"],
+                                [(r["run_id"], r["started"][:19], r["processed"], r["relevant"], r["form_attempted"],
+                                  r["applied"], r["applied_per_hour"], r["ai_calls_per_application"])
+                                 for r in runs[-20:]]), ""]
+
+    lines += ["## Outcomes", _table(["Outcome", "Jobs", "Share"],
+                                    [(o, n, f"{n / aggregates.records:.1%}")
+                                     for o, n in aggregates.outcomes.most_common()]), ""]
+    lines += ["## Top failure statuses", _table(["Status", "Jobs"], aggregates.statuses.most_common(10)), ""]
+
+    phase_rows = []
+    for phase, values in aggregates.phases.items():
+        ordered = sorted(values)
+        if ordered:
+            phase_rows.append((phase, len(ordered), f"{_percentile(ordered, 0.5):.1f}",
+                               f"{_percentile(ordered, 0.95):.1f}", f"{sum(ordered) / len(ordered):.1f}"))
+    lines += ["## Time per phase (seconds)", _table(["Phase", "Jobs", "p50", "p95", "Mean"], phase_rows), ""]
+
+    calls = sorted(aggregates.ai_calls)
+    if calls:
+        lines += ["## AI calls",
+                  f"- Per job: p50 {_percentile(calls, 0.5)}, p95 {_percentile(calls, 0.95)}, total {sum(calls)}",
+                  f"- Per application: {sum(calls) / applied:.1f}" if applied else "- Per application: -", ""]
+
+    lines += ["## Relevancy", _table(["Relevancy %", "Jobs"],
+                                     [(f"{b}-{b + 9 if b < 90 else 100}", aggregates.relevancy[b])
+                                      for b in sorted(aggregates.relevancy)]), ""]
+    lines += ["## Companies with most failed forms", _table(["Company", "Failed"],
+                                                             aggregates.failed_companies.most_common(10)), ""]
+    return "\n".join(lines)
+
+
+def analyze(records, since=None):
+    aggregates = Aggregates()
+    for record in records:
+        if since and record.get("recorded_at", "") < since:
+            continue
+        aggregates.add(record)
+    return aggregates
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analytics over the application history")
+    parser.add_argument("--since", help="only records on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--out", default=str(OUTPUT_DIR), help="directory for the report files")
+    args = parser.parse_args()
+
+    aggregates = analyze(iter_job_records(), args.since)
+    if not aggregates.records:
+        print("No job records found.")
+        return
+    runs = sorted(run_rows(aggregates), key=lambda r: r["started"])
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    report_file = out_dir / "run_report.md"
+    report_file.write_text(render_report(aggregates, runs), encoding="utf-8")
+    export_csv(out_dir / "run_report.csv", runs, RUN_COLUMNS)
+    print(f"Analyzed {aggregates.records} job records in {len(runs)} runs: {report_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,12 @@ JOB_LOCATION = "Singapore"
 
 # Apply only relevant jobs on or above
 RELEVANCY_PERCENTAGE = 80
+# Local keyword (BM25) relevancy score 0-100 from JOB_KEYWORDS and the resume skills, checked before the AI relevancy
+# check: below REJECT the job is skipped without asking AI, at or above PASS it is applied to without the AI check
+# (None = off). Both are off until picked from the score histogram against past AI scores:
+# `PYTHONPATH=src python src/utils/relevancy_prefilter.py calibrate`
+RELEVANCY_PREFILTER_REJECT = None
+RELEVANCY_PREFILTER_PASS = None
 
 # Exclude companies
 EXCLUDE_COMPANIES = []
@@ -18,10 +24,77 @@ OPEN_MAXIMIZED = True
 
 # OpenAI model
 OPENAI_MODEL = "gpt-5-mini"
+# AI requests in flight at once (also the size of the HTTP connection pool)
+AI_MAX_CONCURRENCY = 8
+# Timeout in seconds per AI call type
+AI_TIMEOUTS = {
+    "parse": 60,
+    "answer": 30,
+    "batch": 90,
+    "relevancy": 60,
+    "message": 60,
+    "context": 120,
+    "profile": 180,
+    "upload": 180,
+}
+AI_DEFAULT_TIMEOUT = 60
 
 # Job application settings
 CONNECT_RECRUITER = True
 MESSAGE_RECRUITER = True
+# Jobs already processed are skipped in search results until this many days passed since, per last outcome
+# (None = never revisit, 0 = always revisit)
+SEEN_JOB_REVISIT_DAYS = {
+    "applied": None,
+    "closed": None,
+    "excluded": 30,
+    "not_relevant": 14,
+    "missing_details": 1,
+    "error": 0,
+}
+# Relevancy evaluations (and their job conversation) are reused for a job seen again with the same description,
+# resume and model, for up to this many days (OpenAI keeps stored conversations for 30 days; 0 = don't reuse)
+RELEVANCY_CACHE_DAYS = 25
+
+# Answer all uncached questions of a form step with a single AI request
+BATCH_FORM_ANSWERS = True
+# Select fields with more options than this are matched locally first and only a shortlist is sent to AI
+SELECT_SHORTLIST_SIZE = 10
+# Background threads looking up uncached answers while earlier fields are typed (0 = no overlap)
+AI_PREFETCH_WORKERS = 4
+# Frequent screening questions answered with one batched AI request at startup, whenever the resume, qna_list,
+# model or this list changed. Options must be listed exactly as the form shows them to share its cache entry.
+WARMUP_QUESTIONS = [
+    {"type": "text", "question": "How many years of work experience do you have?"},
+    {"type": "text", "question": "What is your notice period?"},
+    {"type": "text", "question": "What is your expected salary?"},
+    {"type": "text", "question": "What is your current salary?"},
+    {"type": "text", "question": "City"},
+    {"type": "select", "question": "Will you now or in the future require sponsorship for employment visa status?",
+     "options": ["Yes", "No"]},
+    {"type": "select", "question": "Are you comfortable commuting to this job's location?", "options": ["Yes", "No"]},
+    {"type": "select", "question": "Are you comfortable working in an onsite setting?", "options": ["Yes", "No"]},
+    {"type": "select", "question": "Are you comfortable working in a hybrid setting?", "options": ["Yes", "No"]},
+    {"type": "select", "question": "Are you comfortable working in a remote setting?", "options": ["Yes", "No"]},
+    {"type": "select", "question": "Will you be able to reliably commute or relocate to this job's location?",
+     "options": ["Yes", "No"]},
+    {"type": "select", "question": "Have you completed the following level of education: Bachelor's Degree?",
+     "options": ["Yes", "No"]},
+    {"type": "select", "question": "Do you have a valid driver's license?", "options": ["Yes", "No"]},
+    {"type": "select", "question": "Are you willing to undergo a background check, in accordance with local law/regulations?",
+     "options": ["Yes", "No"]},
+    {"type": "select", "question": "Are you willing to take a drug test, in accordance with local law/regulations?",
+     "options": ["Yes", "No"]},
+]
+# Local nearest-neighbour answer model trained from the cache (see src/utils/answer_model.py); its answers are
+# used instead of AI only at or above this confidence (0-1)
+ANSWER_MODEL_ENABLED = True
+ANSWER_MODEL_MIN_CONFIDENCE = 0.9
+# Long-form answers (cover letter, headline, summary, recruiter notes) are reused as templates for jobs with a
+# similar title: regenerate after N uses (None = never) or when the relevancy "match" keywords overlap less than this
+TEMPLATE_CACHE_ENABLED = True
+TEMPLATE_MAX_USES = 5
+TEMPLATE_MIN_MATCH_OVERLAP = 0.3
 
 # Base directories
 BASE_DIR = Path(__file__).parent.parent
@@ -39,10 +112,44 @@ JOB_URLS_FILE = MY_DATA_DIR / "apply_with_urls.txt"
 
 # System data paths
 CACHE_FILE = SYS_DATA_DIR / "qnas_cache.json"
+CACHE_LOG_FILE = SYS_DATA_DIR / "qnas_cache.log"
+CACHE_META_FILE = SYS_DATA_DIR / "qnas_cache_meta.json"
+CACHE_META_LOG_FILE = SYS_DATA_DIR / "qnas_cache_meta.log"
 RUN_DATA_FILE = SYS_DATA_DIR / "run_data.json"
 TRAINED_DATA_FILE = SYS_DATA_DIR / "trained-data.txt"
+CANDIDATE_PROFILE_FILE = SYS_DATA_DIR / "candidate_profile.json"
+ANSWER_MODEL_FILE = SYS_DATA_DIR / "answer_model.json"
+JOB_LEDGER_FILE = SYS_DATA_DIR / "job_ledger.jsonl"
+JOB_LEDGER_MAX_BYTES = 50 * 1024 * 1024  # rotated (gzipped) beyond this; the JSON backend only
+SEEN_JOBS_FILE = SYS_DATA_DIR / "seen_jobs.json"
+SEEN_JOBS_LOG_FILE = SYS_DATA_DIR / "seen_jobs.log"
+RELEVANCY_CACHE_FILE = SYS_DATA_DIR / "relevancy_cache.json"
+RELEVANCY_CACHE_LOG_FILE = SYS_DATA_DIR / "relevancy_cache.log"
+RELEVANCY_PREFILTER_FILE = SYS_DATA_DIR / "relevancy_prefilter.json"
+RELEVANCY_PREFILTER_LOG_FILE = SYS_DATA_DIR / "relevancy_prefilter.log"
+FIELD_CONSTRAINTS_FILE = SYS_DATA_DIR / "field_constraints.json"
+FIELD_CONSTRAINTS_LOG_FILE = SYS_DATA_DIR / "field_constraints.log"
 LINKEDIN_STATE_FILE = SYS_DATA_DIR / "login" / "linkedin_state.json"
 
+# Storage backend for the answer cache, run data and qna list:
+# "json" (local files) or "sqlite" (one shared WAL database, safe for several applier processes)
+STORAGE_BACKEND = "json"
+SQLITE_DB_FILE = SYS_DATA_DIR / "job_applier.db"
+
+# qna_list, instructions and trained-data files are written in the background every N seconds,
+# after each job and at exit (0 = write immediately)
+WRITE_BEHIND_INTERVAL = 5.0
+
+# Prompt cache log: fsync after N writes or T seconds, compact once the log outgrows the cache
+CACHE_FSYNC_EVERY = 50
+CACHE_FSYNC_INTERVAL = 2.0
+CACHE_COMPACT_MIN_OPS = 1000
+
+# Prompt cache bounds per namespace ("text", "select", "template"): max entries (least recently used evicted first)
+# and time-to-live in days since the answer was cached (None = unbounded / never expires)
+CACHE_MAX_ENTRIES = {"text": 20000, "select": 20000, "template": 2000}
+CACHE_TTL_DAYS = {"text": None, "select": None, "template": None}
+
 # API Keys (prefer environment variables)
 OPENAI_KEY_FILE = KEYS_DIR / "openai-key.txt"
 GEMINI_KEY_FILE = KEYS_DIR / "gemini-key.txt"
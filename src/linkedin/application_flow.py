@@ -1,14 +1,21 @@
 import json
+import re
+import time
 
-from ai.openai_provider import parse_hiring_team, start_current_job_query_chat, parse_message_form, parse_profile
+from ai.openai_provider import start_current_job_query_chat, start_current_job_chat_lazily, get_ai_call_count
 from config import EXCLUDE_COMPANIES, RELEVANCY_PERCENTAGE, CONNECT_RECRUITER, MESSAGE_RECRUITER
+from utils.application_ledger import record_job
 from utils.qna_manager import get_recruiter_message, get_recruiter_connect_note
+from utils.relevancy_prefilter import prefilter_relevancy
+from utils.seen_jobs import mark_job_seen
+from utils.template_cache import set_current_job
 from .constants import timeout_1s, timeout_2s, timeout_5s
 from .dom_parser import (
     extract_form_fields,
     extract_form_info,
     extract_step_controls,
     form_state, extract_job_details)
+from .extractors import get_hiring_team, get_message_form, get_recruiter_profile, save_extractor_stats
 from .form_filler import fill_all_fields
 
 
@@ -94,14 +101,41 @@ def process_form_step(page, application_form, previous_state):
 
     return True, current_state
 
-def apply_job(page, ignore_relevancy=False):
-    """Applies to a job using the Easy Apply button, handling multi-step forms."""
+def _job_id_from_url(url):
+    match = re.search(r"currentJobId=(\d+)|/jobs/view/(\d+)", url or "")
+    return next((g for g in match.groups() if g), None) if match else None
+
+def apply_job(page, ignore_relevancy=False, run_id=None):
+    """
+    Applies to a job using the Easy Apply button, handling multi-step forms.
+    Every job processed is recorded in the application ledger with its outcome and timings.
+    """
     print("------------------------- Applying job -------------------------")
+    started = time.perf_counter()
+    ai_calls = get_ai_call_count()
+    job_record = {"job_id": _job_id_from_url(page.url), "run_id": run_id, "url": page.url, "timings": {}}
+    status, message = False, "Error"
+    try:
+        status, message = _apply_job(page, ignore_relevancy, job_record)
+        return status, message
+    finally:
+        job_record["timings"]["total"] = round(time.perf_counter() - started, 2)
+        job_record["ai_calls"] = get_ai_call_count() - ai_calls
+        record_job(dict(job_record, applied=bool(status), status=message))
+        mark_job_seen(job_record["job_id"], status, message)
+
+def _timed(job_record, phase, started):
+    job_record["timings"][phase] = round(time.perf_counter() - started, 2)
+
+def _apply_job(page, ignore_relevancy, job_record):
+    started = time.perf_counter()
     job_details_section = page.wait_for_selector(
         'main :is(div[class*="job-details"], div[class*="jobs-details"], div[class*="job-view-layout"])',
         timeout=timeout_5s,
     )
     job_details = extract_job_details(job_details_section)
+    _timed(job_record, "extract", started)
+    job_record.update(title=job_details.get("title"), company=job_details.get("company"))
     print(f"Job details: {json.dumps(job_details, indent=2)}")
     company = job_details.get('company', "").lower()
     if not company or not job_details.get('title') or not job_details.get('description'):
@@ -115,22 +149,41 @@ def apply_job(page, ignore_relevancy=False):
     if not is_open:
         return False, easy_apply_btn_or_msg
 
-    relevancy_status = start_current_job_query_chat(job_details)
+    started = time.perf_counter()
+    # clearly off-target (or on-target) jobs are decided by the local keyword score without asking AI
+    job_record["prefilter_score"], relevancy_status = prefilter_relevancy(job_details, allow_reject=not ignore_relevancy,
+                                                                         job_id=job_record["job_id"])
+    if relevancy_status:
+        job_record["relevancy_source"] = "prefilter"
+        start_current_job_chat_lazily(job_details)
+    else:
+        relevancy_status = start_current_job_query_chat(job_details, job_record["job_id"])
+    _timed(job_record, "relevancy", started)
+    set_current_job(job_details, relevancy_status)
     relevancy_percentage = relevancy_status.get("relevancyPercentage", 0)
+    job_record["relevancy"] = relevancy_percentage
     print(f"Relevancy status: {json.dumps(relevancy_status, indent=2)}")
     if ignore_relevancy:
         print(f"Ignoring relevancy check due to ignore_relevancy flag")
+    elif relevancy_status.get("source") == "prefilter":
+        if not relevancy_status["isRelevant"]:
+            return False, "Job not relevant (local score)"
     elif relevancy_percentage < RELEVANCY_PERCENTAGE:
         return False, "Job not relevant"
 
+    started = time.perf_counter()
     easy_apply_btn_or_msg.click()
     page.wait_for_timeout(timeout_1s)
     status, message = handle_application_form(page)
+    _timed(job_record, "form", started)
     if status:
         print("Job applied successfully!")
         if CONNECT_RECRUITER or MESSAGE_RECRUITER:
             print("Contacting recruiter...")
+            started = time.perf_counter()
             rcr_status, rcr_msg = contact_recruiter(page, job_details_section)
+            _timed(job_record, "recruiter", started)
+            job_record["recruiter_status"] = rcr_msg
             print(f"Recruiter contact status: {rcr_status}, message: {rcr_msg}")
 
     return status, message
@@ -138,7 +191,7 @@ def apply_job(page, ignore_relevancy=False):
 def contact_recruiter(page, job_details_section):
     new_tab = None
     try:
-        hiring_team = parse_hiring_team(job_details_section.inner_html())
+        hiring_team = get_hiring_team(job_details_section)
         if not hiring_team:
             return False, "No hiring team found"
         recruiter = next((r for r in hiring_team if r.get('isJobPoster')), hiring_team[0])
@@ -160,7 +213,7 @@ def contact_recruiter(page, job_details_section):
         if more_button:
             more_button.click()
             more_dropdown = new_tab.query_selector('div[role="menu"]')
-        recruiter = parse_profile(main_section.inner_html() + (more_dropdown.inner_html() if more_dropdown else ""))
+        recruiter = get_recruiter_profile(main_section, more_dropdown)
 
         rct_conn_status, rct_conn_msg = False, ""
         if (CONNECT_RECRUITER and not recruiter.get('isConnected')
@@ -182,6 +235,7 @@ def contact_recruiter(page, job_details_section):
         print(f"Failed to contact recruiter: {e}")
         return False, "Failed to contact recruiter"
     finally:
+        save_extractor_stats()
         print("Closing recruiter profile tab!")
         if new_tab:
             new_tab.close()
@@ -245,7 +299,7 @@ def message_recruiter(page, main_section, recruiter):
     msg_button.click()
     page.wait_for_timeout(timeout_2s)
     msg_form_el = page.query_selector('div[role="dialog"][aria-label="Messaging"]')
-    msg_form = parse_message_form(msg_form_el.inner_html())
+    msg_form = get_message_form(msg_form_el)
     recruiter_message = get_recruiter_message(recruiter_name)
     input_sub_selector = msg_form.get("fields", {}).get('subject', {}).get('selector')
     if input_sub_selector:
@@ -3,3 +3,56 @@
 timeout_5s = 5000  # 5 seconds timeout for waiting for controls
 timeout_2s = 2000  # 2 seconds timeout for waiting for clicks
 timeout_1s = 1000  # 1 second timeout for waiting extra
+
+# "Meet the hiring team" section of the job details, the only part sent to AI to find recruiters
+HIRING_TEAM_SELECTORS = [
+    '.job-details-people-who-can-help',
+    'div[class*="hirer-card"]',
+    'div[class*="hiring-team"]',
+]
+
+# Selector sets of the deterministic recruiter-path extractors (dom_parser.extract_hiring_team, extract_profile,
+# extract_message_form), newest first. When LinkedIn changes its markup add a version instead of editing one;
+# each extraction records which version matched, or "ai" when none did and AI parsed the page.
+HIRING_TEAM_SELECTOR_SETS = {
+    "2025.1": {
+        "card": 'div[class*="hirer-card__hirer-information"]',
+        "container": 'div[class*="hirer-card__container"], div[class*="hirer-card"]',
+        "name": '.jobs-poster__name, a[href*="/in/"] strong',
+        "designation": '.linked-area .text-body-small, .hirer-card__hirer-information .text-body-small',
+        "profileLink": 'a[href*="/in/"]',
+        "jobPosterText": "Job poster",
+        "messageLabel": "^Message",
+    },
+    "2024.1": {
+        "card": '.job-details-people-who-can-help li',
+        "container": 'li',
+        "name": 'a[href*="/in/"] span[aria-hidden="true"], a[href*="/in/"] strong',
+        "designation": '.t-14, .text-body-small',
+        "profileLink": 'a[href*="/in/"]',
+        "jobPosterText": "Job poster",
+        "messageLabel": "^Message",
+    },
+}
+PROFILE_SELECTOR_SETS = {
+    "2025.1": {
+        "name": 'h1',
+        "designation": '.text-body-medium',
+        "location": '.text-body-small.inline, span[class*="location"]',
+        "company": 'button[aria-label^="Current company"], ul[class*="top-card"] button',
+        "distance": '.dist-value, span[class*="distance-badge"]',
+        "buttons": 'button, a[role="button"], div[role="button"], [role="menuitem"]',
+        "connectLabel": "^(Invite .+ to connect|Connect)$",
+        "pendingLabel": "^Pending|withdraw invitation",
+        "messageLabel": "^Message",
+    },
+}
+MESSAGE_FORM_SELECTOR_SETS = {
+    "2025.1": {
+        "headline": 'h2, [class*="msg-overlay-bubble-header__title"]',
+        "subject": 'input[name="subject"], input[placeholder*="Subject"]',
+        "body": 'div[role="textbox"][contenteditable="true"], textarea[name="message"]',
+        "send": 'button[type="submit"], button[class*="msg-form__send-button"]',
+        "close": 'button[aria-label^="Close your"], button[aria-label*="close" i]',
+    },
+}
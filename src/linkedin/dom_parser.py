@@ -100,6 +100,27 @@ def extract_form_fields(form_element):
             return null;
         };
 
+        // Client-side constraints of a text input, so answers can be checked before typing
+        const getFieldConstraints = (element) => {
+            const hints = (element.getAttribute('aria-describedby') || '').split(/\s+/)
+                .map(id => id && modal.querySelector('#' + CSS.escape(id)))
+                .filter(el => el && !el.querySelector('.artdeco-inline-feedback--error'))
+                .map(el => el.textContent.trim())
+                .filter(Boolean);
+            const constraints = {
+                inputType: element.type || '',
+                inputMode: element.getAttribute('inputmode') || '',
+                numeric: /numeric/i.test(element.id || ''),
+                required: element.required || element.getAttribute('aria-required') === 'true',
+                min: element.getAttribute('min'),
+                max: element.getAttribute('max'),
+                maxLength: element.maxLength > 0 ? element.maxLength : null,
+                pattern: element.getAttribute('pattern'),
+                hints: hints
+            };
+            return Object.fromEntries(Object.entries(constraints).filter(([, v]) => v !== null && v !== '' && v !== false && !(Array.isArray(v) && !v.length)));
+        };
+
         const fields = [];
         const formElements = modal.querySelectorAll('input, select, fieldset, textarea');
     
@@ -137,12 +158,13 @@ def extract_form_fields(form_element):
                 };
             }
             // Text inputs (exclude comboboxes handled above)
-            else if (element.matches('input[type="text"]:not([role="combobox"]), input[type="email"], input[type="tel"], textarea')) {
+            else if (element.matches('input[type="text"]:not([role="combobox"]), input[type="email"], input[type="tel"], input[type="number"], input[type="url"], textarea')) {
                 fieldData = {
                     type: 'text',
                     label: element.labels?.[0]?.querySelector('span[aria-hidden="true"]')?.textContent.trim() || element.labels?.[0]?.innerText?.trim() || '',
                     selector: '#' + element.id,
-                    value: element.value || ''
+                    value: element.value || '',
+                    constraints: getFieldConstraints(element)
                 };
             }
             // Select dropdowns
@@ -153,13 +175,12 @@ def extract_form_fields(form_element):
                     value: opt.value,
                     isSelected: opt.selected
                 }));
-                const topOptions = options.length > 10 ? options.slice(0, 10) : options;
                 fieldData = {
                     type: 'select',
                     label: element.labels?.[0]?.querySelector('span[aria-hidden="true"]')?.textContent.trim() || element.labels?.[0]?.innerText.trim() || '',
                     selector: '#' + element.id,
                     value: element.value,
-                    options: topOptions
+                    options: options
                 };
             }
             // Radio groups (includes checkbox-style)
@@ -278,63 +299,187 @@ def extract_step_controls(element):
     }''')
 
 
-def extract_hiring_team(job_details_section):
-    """Extract a hiring team (recruiters) from a '.job-details-people-who-can-help' element.
+# Shared by the recruiter-path extractors: selectorOf() returns '#id', or tags the element with a data-ja-id
+# (same counter as distill_html) so the selector matches the live DOM.
+_EXTRACTOR_HELPERS = '''
+        const text = (el) => el ? (el.innerText || el.textContent || '').replace(/\\s+/g, ' ').trim() : '';
+        const pick = (root, selector) => root && selector ? root.querySelector(selector) : null;
+        const labelOf = (el) => text(el) || el.getAttribute('aria-label') || '';
+        const matches = (el, pattern) => !!pattern && [text(el), el.getAttribute('aria-label') || '']
+            .some(label => new RegExp(pattern, 'i').test(label));
+        const selectorOf = (el) => {
+            if (el.id) return '#' + CSS.escape(el.id);
+            if (!el.hasAttribute('data-ja-id')) {
+                const nextId = Number(document.body.dataset.jaNextId || 0);
+                el.setAttribute('data-ja-id', String(nextId));
+                document.body.dataset.jaNextId = String(nextId + 1);
+            }
+            return `[data-ja-id="${el.getAttribute('data-ja-id')}"]`;
+        };
+        const button = (el) => el ? {
+            label: labelOf(el),
+            selector: selectorOf(el),
+            isEnabled: !el.disabled && el.getAttribute('aria-disabled') !== 'true'
+        } : {};
+'''
 
-    Args:
-        job_details_section: Element for the hiring team container.
+
+def extract_hiring_team(job_details_section, selectors):
+    """
+    Extract the "Meet the hiring team" recruiters with one of the HIRING_TEAM_SELECTOR_SETS.
 
     Returns:
-        list[dict]: Each recruiter:
-            {
-                "name": str,
-                "designation": str,
-                "isJobPoster": bool,
-                "messageButton": {
-                    "label": str,
-                    "selector": str,
-                    "isEnabled": bool,
-                } | None
-            }
+        list[dict]: Same shape as parse_hiring_team, {name, designation, profileLink, isJobPoster, messageButton}
     """
-    recruiters = []
-    if not job_details_section:
-        return recruiters
-
-    cards = job_details_section.query_selector_all('div[class*="hirer-card__hirer-information"]')
-    if not cards:
-        return recruiters
-
-    for card in cards:
-        try:
-            name = card.query_selector(".jobs-poster__name").inner_text().strip()
-            designation = card.query_selector(".linked-area .text-body-small").inner_text().strip()
-            is_job_poster = "Job poster" in (card.inner_text() or "")
-            msg_btn_el = card.query_selector("button span:text('Message')")
-            message_button = None
-            if msg_btn_el:
-                label = (msg_btn_el.inner_text() or "").strip()
-                btn_id = msg_btn_el.get_attribute("id")
-                selector = f"button#{btn_id}" if btn_id else ".entry-point button.artdeco-button"
-                is_enabled = bool(getattr(msg_btn_el, "is_enabled", lambda: True)())
-                message_button = {
-                    "label": label,
-                    "selector": selector,
-                    "isEnabled": is_enabled,
-                }
+    return job_details_section.evaluate('''(section, sel) => {''' + _EXTRACTOR_HELPERS + '''
+        return Array.from(section.querySelectorAll(sel.card)).map(card => {
+            const container = card.closest(sel.container) || card;
+            const link = pick(card, sel.profileLink) || pick(container, sel.profileLink);
+            const messageButton = Array.from(container.querySelectorAll('button, a[role="button"]'))
+                .find(el => matches(el, sel.messageLabel));
+            return {
+                name: text(pick(card, sel.name)),
+                designation: text(pick(card, sel.designation)),
+                profileLink: link ? link.href.split('?')[0] : '',
+                isJobPoster: text(container).includes(sel.jobPosterText),
+                messageButton: button(messageButton)
+            };
+        });
+    }''', selectors)
 
-            recruiters.append(
-                {
-                    "name": name,
-                    "designation": designation,
-                    "isJobPoster": is_job_poster,
-                    "messageButton": message_button,
-                }
-            )
-        except Exception as e:
-            print(f"Failed to parse hiring team member: {e}")
 
-    return recruiters
+def extract_profile(main_section, menu, selectors):
+    """
+    Extract the person and their connect/message buttons from a profile top card (and its "More" menu)
+    with one of the PROFILE_SELECTOR_SETS.
+
+    Returns:
+        dict: Same shape as parse_profile, {name, company, designation, location, profileLink, isConnected,
+        connectionStatus, messageButton, connectButton, otherButtons}
+    """
+    return main_section.evaluate('''(root, [sel, menu]) => {''' + _EXTRACTOR_HELPERS + '''
+        const buttons = [root, menu].filter(Boolean).flatMap(el => Array.from(el.querySelectorAll(sel.buttons)));
+        const connect = buttons.find(el => matches(el, sel.connectLabel));
+        const pending = buttons.find(el => matches(el, sel.pendingLabel));
+        const message = buttons.find(el => matches(el, sel.messageLabel));
+        const isConnected = /^1st/.test(text(pick(root, sel.distance)));
+        return {
+            name: text(pick(root, sel.name)),
+            company: text(pick(root, sel.company)),
+            designation: text(pick(root, sel.designation)),
+            location: text(pick(root, sel.location)),
+            profileLink: document.location.href.split('?')[0],
+            isConnected: isConnected,
+            connectionStatus: isConnected ? 'Already connected' : pending ? 'Connection Pending' : 'Not invited',
+            messageButton: button(message),
+            connectButton: pending ? Object.assign(button(pending), { label: 'Pending' }) : button(connect),
+            otherButtons: buttons.filter(el => ![connect, pending, message].includes(el) && labelOf(el)).map(button)
+        };
+    }''', [selectors, menu])
+
+
+def extract_message_form(msg_form_element, selectors):
+    """
+    Extract the messaging dialog fields and controls with one of the MESSAGE_FORM_SELECTOR_SETS.
+    Missing fields and controls are {}.
+
+    Returns:
+        dict: Same shape as parse_message_form, {id, headline, fields: {subject, body}, other_fields,
+        controls: {send, close}, other_controls}
+    """
+    return msg_form_element.evaluate('''(dialog, sel) => {''' + _EXTRACTOR_HELPERS + '''
+        const field = (el) => el ? {
+            type: el.tagName === 'TEXTAREA' ? 'textarea' : el.isContentEditable ? 'contenteditable' : (el.type || 'text'),
+            label: el.getAttribute('aria-label') || el.getAttribute('placeholder') || el.name || '',
+            selector: selectorOf(el),
+            value: el.isContentEditable ? text(el) : (el.value || '')
+        } : {};
+        const send = pick(dialog, sel.send);
+        const close = pick(dialog, sel.close);
+        return {
+            id: dialog.id || '',
+            headline: text(pick(dialog, sel.headline)),
+            fields: { subject: field(pick(dialog, sel.subject)), body: field(pick(dialog, sel.body)) },
+            other_fields: [],
+            controls: { send: button(send), close: button(close) },
+            other_controls: Array.from(dialog.querySelectorAll('button'))
+                .filter(el => el !== send && el !== close && labelOf(el)).map(button)
+        };
+    }''', selectors)
+
+
+def distill_html(element, keep=None, label="element"):
+    """
+    Return a compact HTML of element for AI parsing: interactive elements with their id, name, role,
+    aria and href attributes, plus visible text. Scripts, SVG, styles, classes and tracking attributes
+    are dropped, and plain wrappers are unwrapped. Elements without an id get a data-ja-id attribute on
+    the page too, so selectors built from the distilled HTML still match the live DOM.
+
+    Args:
+        element: Element to distill
+        keep: CSS selectors; if any matches, only those subtrees are kept
+        label: Name for the size report
+    """
+    result = element.evaluate('''(root, keep) => {
+        const SKIP = new Set(['SCRIPT', 'STYLE', 'SVG', 'NOSCRIPT', 'TEMPLATE', 'IFRAME', 'LINK', 'META', 'PATH',
+                              'CODE', 'HR', 'BR']);
+        const INTERACTIVE = new Set(['A', 'BUTTON', 'INPUT', 'TEXTAREA', 'SELECT', 'OPTION', 'LABEL', 'FORM']);
+        const KEEP_TAGS = new Set(['H1', 'H2', 'H3', 'H4', 'LI', 'UL', 'DIALOG']);
+        const ATTRS = ['id', 'name', 'type', 'role', 'aria-label', 'aria-labelledby', 'aria-expanded', 'aria-pressed',
+                       'aria-disabled', 'disabled', 'placeholder', 'for', 'value', 'contenteditable', 'data-ja-id'];
+        const MAX_TEXT = 200;
+        let nextId = Number(document.body.dataset.jaNextId || 0);
+
+        const escape = (text) => text.replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;');
+        const cleanHref = (href) => href.split('?')[0].split('#')[0];
+
+        function isInteractive(el) {
+            return INTERACTIVE.has(el.tagName) || el.hasAttribute('contenteditable')
+                || ['button', 'link', 'menuitem', 'textbox', 'dialog', 'checkbox'].includes(el.getAttribute('role'));
+        }
+
+        function distill(node) {
+            if (node.nodeType === Node.TEXT_NODE) {
+                let text = node.textContent.replace(/\\s+/g, ' ').trim();
+                if (text.length > MAX_TEXT) text = text.slice(0, MAX_TEXT) + '…';
+                return text ? escape(text) : '';
+            }
+            if (node.nodeType !== Node.ELEMENT_NODE) return '';
+            const tag = node.tagName.toUpperCase();
+            if (SKIP.has(tag) || node.hidden || node.getAttribute('aria-hidden') === 'true'
+                || (tag === 'INPUT' && node.type === 'hidden')) {
+                return '';
+            }
+            const inner = Array.from(node.childNodes).map(distill).filter(Boolean).join(' ');
+            const interactive = isInteractive(node);
+            if (!interactive && !KEEP_TAGS.has(tag) && !node.id && !node.getAttribute('aria-label')) {
+                return inner;
+            }
+            if (interactive && !node.id && !node.hasAttribute('data-ja-id')) {
+                node.setAttribute('data-ja-id', String(nextId++));
+            }
+            const name = tag.toLowerCase();
+            let attrs = ATTRS.filter(a => node.hasAttribute(a))
+                .map(a => ` ${a}="${escape(node.getAttribute(a)).replace(/"/g, '&quot;')}"`).join('');
+            if (node.hasAttribute('href')) attrs += ` href="${escape(cleanHref(node.getAttribute('href')))}"`;
+            if (!inner && !interactive) return '';
+            return `<${name}${attrs}>${inner}</${name}>`;
+        }
+
+        // a keep match inside another one is already in that one's html
+        const matches = keep ? Array.from(root.querySelectorAll(keep)) : [];
+        const roots = matches.filter(r => !matches.some(o => o !== r && o.contains(r)));
+        const html = (roots.length ? roots : [root]).map(distill).join('\\n');
+        document.body.dataset.jaNextId = String(nextId);
+        return { html, originalBytes: new TextEncoder().encode(root.outerHTML).length };
+    }''', ", ".join(keep) if keep else None)
+    html = result["html"]
+    original, distilled = result["originalBytes"], len(html.encode("utf-8"))
+    if original:
+        # ~4 bytes per token for markup
+        print(f"Distilled {label} HTML: {original} -> {distilled} bytes ({1 - distilled / original:.0%} smaller), "
+              f"~{original // 4} -> ~{distilled // 4} tokens")
+    return html
 
 
 def form_state(form_info, form_fields):
@@ -1,10 +1,11 @@
 import datetime
 
-from openai import RateLimitError, OpenAIError
-
+from ai.openai_provider import ai_error_kind
 from config import JOB_URLS_FILE
 from utils.run_data_manager import update_run_data_job_applications
+from utils.seen_jobs import should_skip_job
 from utils.txt_utils import remove_line_from
+from utils.write_behind import flush_writes
 from .application_flow import apply_job, dismiss_job_apply
 from .constants import timeout_2s
 from .job_search import fetch_job_list, click_job_card
@@ -12,10 +13,12 @@ from .job_search import fetch_job_list, click_job_card
 
 def easy_apply_by_url(page, job_urls):
     """Performs the Easy Apply process given the list of job URLs."""
+    run_id = f"urls_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
     for job_url in job_urls:
         page.goto(job_url)
         page.wait_for_timeout(timeout_2s)
-        applied, status = apply_job(page, True)
+        applied, status = apply_job(page, True, run_id)
+        flush_writes()
         print(f"Job URL: {job_url}, applied: {applied}, status: {status}")
         if applied:
             remove_line_from(JOB_URLS_FILE, job_url)
@@ -39,11 +42,16 @@ def apply_jobs_easy_apply(page, keywords, location):
             break
         print(f"Found {len(jobs)} jobs on the current page.")
         for job in jobs:
+            job_id = job.get_attribute("data-job-id")
+            seen_outcome = should_skip_job(job_id)
+            if seen_outcome:
+                print(f"Skipping job {job_id}, already processed: {seen_outcome}")
+                continue
             try:
                 if not click_job_card(page, job):
                     return False, "Failed to click job card"
                 page.wait_for_timeout(timeout_2s)
-                applied, status = apply_job(page)
+                applied, status = apply_job(page, run_id=job_application_id)
                 if applied:
                     jobs_applied += 1
                     print("Successfully applied: ", jobs_applied)
@@ -59,16 +67,18 @@ def apply_jobs_easy_apply(page, keywords, location):
                 else:
                     print(f"Failed to apply. Status: {status}")
                 update_run_data_job_applications(job_application_id, keywords, location, current_page, applied, status)
-            except RateLimitError as e:
-                print("Rate limit exceeded:", e)
-                return False, "OpenAI Rate limit exceeded"
-            except OpenAIError as e:
-                print("Any OpenAI-related error:", e)
-                return False, "OpenAI error"
             except Exception as e:
+                error_kind = ai_error_kind(e)
+                if error_kind == "rate_limit":
+                    print("Rate limit exceeded:", e)
+                    return False, "OpenAI Rate limit exceeded"
+                if error_kind == "api":
+                    print("Any OpenAI-related error:", e)
+                    return False, "OpenAI error"
                 print(f"Error applying the job: {e}")
             finally:
                 dismiss_job_apply(page, None)
+                flush_writes()
         print(f"Page ({current_page}) finished.")
         next_page_button = page.query_selector(next_page_selector)
         if next_page_button:
@@ -0,0 +1,113 @@
+"""
+Recruiter-path details (hiring team, recruiter profile, messaging dialog) read from the DOM with versioned selector
+sets, falling back to AI parsing of the distilled HTML only when no selector set gives a valid result.
+Which selector version matched, or "ai"/"failed", is counted per extractor in memory and added to
+run_data["extractor_stats"] once per job (save_extractor_stats).
+"""
+from collections import Counter
+
+from ai.openai_provider import parse_hiring_team, parse_message_form, parse_profile
+from utils.run_data_manager import get_run_data, update_run_data
+from .constants import (
+    HIRING_TEAM_SELECTORS, HIRING_TEAM_SELECTOR_SETS, MESSAGE_FORM_SELECTOR_SETS, PROFILE_SELECTOR_SETS)
+from .dom_parser import distill_html, extract_hiring_team, extract_message_form, extract_profile
+
+_run_stats = {}  # kind -> Counter of this run's outcomes
+_unsaved = {}  # kind -> Counter of outcomes not yet added to run_data
+
+
+def _valid_hiring_team(recruiters):
+    return (bool(recruiters) and all(r.get("name") for r in recruiters)
+            and any(r.get("profileLink") for r in recruiters))
+
+
+def _valid_profile(person):
+    # A 1st degree badge, or a Connect/Pending button, tells the connection state; without either it is a guess
+    return bool(person.get("name")) and (person.get("isConnected") or bool(person.get("connectButton")))
+
+
+def _valid_message_form(msg_form):
+    return bool(msg_form["fields"]["body"].get("selector")) and bool(msg_form["controls"]["send"].get("selector"))
+
+
+def _record(kind, outcome):
+    _run_stats.setdefault(kind, Counter())[outcome] += 1
+    _unsaved.setdefault(kind, Counter())[outcome] += 1
+
+
+def save_extractor_stats():
+    """Add the outcomes counted since the last save to run_data["extractor_stats"]; called once per job."""
+    if not _unsaved:
+        return
+    stats = get_run_data().get("extractor_stats") or {}
+    for kind, counts in _unsaved.items():
+        saved = stats.setdefault(kind, {})
+        for outcome, count in counts.items():
+            saved[outcome] = saved.get(outcome, 0) + count
+    _unsaved.clear()
+    update_run_data("extractor_stats", stats)
+
+
+def _extract(kind, selector_sets, extract, validate, fallback):
+    """Try each selector set, newest first, then the AI fallback. Records which one was used."""
+    for version, selectors in selector_sets.items():
+        try:
+            result = extract(selectors)
+        except Exception as e:
+            print(f"{kind} extractor {version} failed: {e}")
+            continue
+        if result and validate(result):
+            _record(kind, version)
+            return result
+    print(f"No {kind} selector set matched, parsing with AI")
+    try:
+        result = fallback()
+    except Exception:
+        _record(kind, "failed")
+        raise
+    _record(kind, "ai" if result else "failed")
+    return result
+
+
+def get_hiring_team(job_details_section):
+    """Hiring team recruiters of the job, as parse_hiring_team returns them."""
+    return _extract("hiring_team", HIRING_TEAM_SELECTOR_SETS,
+                    lambda selectors: extract_hiring_team(job_details_section, selectors), _valid_hiring_team,
+                    lambda: parse_hiring_team(distill_html(job_details_section, keep=HIRING_TEAM_SELECTORS,
+                                                           label="job details")))
+
+
+def get_recruiter_profile(main_section, more_dropdown=None):
+    """Person details and buttons of a profile page, as parse_profile returns them."""
+    def parse_with_ai():
+        profile_html = distill_html(main_section, label="profile")
+        if more_dropdown:
+            profile_html += "\n" + distill_html(more_dropdown, label="profile menu")
+        return parse_profile(profile_html)
+
+    return _extract("profile", PROFILE_SELECTOR_SETS,
+                    lambda selectors: extract_profile(main_section, more_dropdown, selectors), _valid_profile,
+                    parse_with_ai)
+
+
+def get_message_form(msg_form_element):
+    """Fields and controls of the messaging dialog, as parse_message_form returns them."""
+    return _extract("message_form", MESSAGE_FORM_SELECTOR_SETS,
+                    lambda selectors: extract_message_form(msg_form_element, selectors), _valid_message_form,
+                    lambda: parse_message_form(distill_html(msg_form_element, label="message form")))
+
+
+def print_extractor_stats():
+    """Print this run's and the all-time share of recruiter-path extractions that needed AI."""
+    if not _run_stats:
+        return
+    save_extractor_stats()
+    print("Recruiter page extractor stats:")
+    all_time = get_run_data().get("extractor_stats") or {}
+    for kind, counts in _run_stats.items():
+        total = sum(counts.values())
+        kind_all_time = all_time.get(kind) or counts
+        total_all_time = sum(kind_all_time.values())
+        fallback_all_time = kind_all_time.get("ai", 0) + kind_all_time.get("failed", 0)
+        print(f"  {kind}: {dict(counts)}, AI fallback {(counts['ai'] + counts['failed']) / total:.0%} "
+              f"(all time {fallback_all_time / total_all_time:.0%} of {total_all_time})")
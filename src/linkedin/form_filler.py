@@ -1,4 +1,5 @@
-from utils.qna_manager import get_text_answer, get_select_answer
+from utils.answer_validator import get_constraints, learn_from_error, coerce_answer, describe_constraints
+from utils.qna_manager import get_text_answer, get_select_answer, prefetch_form_answers, collect_prefetched_answers
 from .constants import timeout_1s, timeout_2s, timeout_5s
 
 
@@ -10,14 +11,42 @@ def fill_all_fields(page, input_fields, has_errors: bool = False):
     if has_errors:
         print("Filling only error fields... ")
         input_fields = [f for f in input_fields if f.get("hasError", False)]
-    for input_field in input_fields:
-        field_type = input_field["type"]
-        if field_type == "text":
-            enter_text_field(page, input_field)
-        elif field_type in ["select", "radio"]:
-            select_option(page, input_field)
-        elif field_type == "combobox":
-            fill_combobox(page, input_field)
+    # AI lookups for uncached fields run while the fields before them are being typed
+    prefetch_form_answers(_form_questions(input_fields))
+    try:
+        for input_field in input_fields:
+            field_type = input_field["type"]
+            if field_type == "text":
+                enter_text_field(page, input_field)
+            elif field_type in ["select", "radio"]:
+                select_option(page, input_field)
+            elif field_type == "combobox":
+                fill_combobox(page, input_field)
+    finally:
+        collect_prefetched_answers()
+
+
+def _form_questions(input_fields):
+    """Build the questions that the fill loop below will ask, for prefetching."""
+    questions = []
+    for field in input_fields:
+        label = field.get("label")
+        if not label:
+            continue
+        if field["type"] == "text":
+            if field.get("error") and not field.get("value"):
+                continue
+            questions.append({"type": "text", "question": label, "validation": field.get("error")})
+        elif field["type"] in ["select", "radio"]:
+            questions.append({"type": "select", "question": label,
+                              "options": _answer_options(field.get("options", []))})
+        elif field["type"] == "combobox":
+            questions.append({"type": "text", "question": label})
+    return questions
+
+
+def _answer_options(options):
+    return [opt["label"] for opt in options if opt["label"].lower() != "select an option"]
 
 
 def enter_text_field(page, input_field):
@@ -33,7 +62,9 @@ def enter_text_field(page, input_field):
     if error and not current_value:
         print(f"Field has error '{error}' but no current value. Skipping...")
         return
-    new_value = get_text_answer(input_field.get("label"), error)
+    if error:
+        learn_from_error(label, error)
+    new_value = _valid_text_answer(label, error, get_constraints(label, input_field))
     if new_value and new_value != current_value:
         if current_value:
             page.fill(selector, "")
@@ -42,6 +73,21 @@ def enter_text_field(page, input_field):
         page.wait_for_timeout(timeout_1s)
 
 
+def _valid_text_answer(label, error, constraints):
+    """Answer coerced to the field's constraints; asks again with the constraints spelled out if it can't be."""
+    answer = get_text_answer(label, error)
+    valid = coerce_answer(answer, constraints)
+    if valid is None and not error and describe_constraints(constraints):
+        print(f"Answer '{answer}' does not satisfy {constraints}, asking again")
+        answer = get_text_answer(label, describe_constraints(constraints))
+        valid = coerce_answer(answer, constraints)
+    if valid is None:
+        return answer  # type it anyway, LinkedIn will show the error
+    if valid != answer:
+        print(f"Coerced answer '{answer}' -> '{valid}'")
+    return valid
+
+
 def select_option(page, field_info):
     """Select an option for dropdown or radio group based on the provided field_info."""
     label = field_info.get("label")
@@ -53,22 +99,13 @@ def select_option(page, field_info):
     options = field_info.get("options", [])
 
     current_value = field_info.get("value", "")
-    temp_options = [
-        opt["label"] for opt in options if opt["label"].lower() != "select an option"
-    ]
-    answer = get_select_answer(label, temp_options)
+    answer = get_select_answer(label, _answer_options(options))
 
     if current_value != answer:
-        selected_option = next(
-            (
-                opt
-                for opt in options
-                if opt["label"].strip().lower() == answer.strip().lower()
-            ),
-            options[0] if options else None,
-        )
+        # answer is already mapped onto one of the option labels, never guess the first option
+        selected_option = next((opt for opt in options if opt["label"] == answer), None) if answer else None
         if not selected_option:
-            print(f"No options available for field '{label}'")
+            print(f"No matching option to select for field '{label}'")
             return
         print(f"Selecting option '{selected_option['label']}' for field '{label}'")
         select_control(
@@ -1,18 +1,24 @@
-from playwright.sync_api import sync_playwright
-
 from config import HIDE_BROWSER, OPEN_MAXIMIZED, JOB_KEYWORDS, JOB_LOCATION, JOB_URLS_FILE
 from linkedin.constants import timeout_1s
 from linkedin.easy_apply import apply_jobs_easy_apply, easy_apply_by_url
+from linkedin.extractors import print_extractor_stats
 from linkedin.login import login
+from utils.cache_manager import print_cache_stats
+from utils.qna_manager import start_cache_warmup, finish_cache_warmup
 from utils.user_data_manager import read_header_file
 
 
 def main():
+    from playwright.sync_api import sync_playwright  # imported here so the module loads fast without a browser
+
     with sync_playwright() as p:
         print("Starting JobApplier.AI...")
+        # the warm-up request runs while the browser starts and logs in
+        start_cache_warmup()
         args = ["--start-maximized"] if OPEN_MAXIMIZED else []
         browser = p.chromium.launch(headless=HIDE_BROWSER, args=args)
         page, logged_in = login(browser, save_login=True)
+        finish_cache_warmup()
         if logged_in:
             _, job_urls = read_header_file(JOB_URLS_FILE, 5)
             valid_job_urls = [u for u in job_urls if u.startswith("https://")]
@@ -24,6 +30,8 @@ def main():
                 apply_jobs_easy_apply(page, JOB_KEYWORDS, JOB_LOCATION)
         else:
             print("Login failed. Exiting.")
+        print_cache_stats()
+        print_extractor_stats()
         page.wait_for_timeout(timeout_1s)
         browser.close()
 
@@ -0,0 +1,232 @@
+"""
+Local nearest-neighbour answer model: char n-gram TF-IDF over the canonical questions of cached answers.
+CPU only, no dependencies. Retrained on load whenever the cached answers differ from the ones it was trained on;
+train by hand with `PYTHONPATH=src python src/utils/answer_model.py train`.
+"""
+import ast
+import datetime
+import hashlib
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+
+from config import ANSWER_MODEL_FILE, ANSWER_MODEL_ENABLED, ANSWER_MODEL_MIN_CONFIDENCE
+from utils.option_matcher import match_option, normalize_option
+from utils.question_normalizer import canonical_question
+
+_NGRAM_SIZES = (3, 4, 5)
+_NEIGHBOURS = 5
+_MAX_TEXT_ANSWER_LEN = 40  # longer free-text answers are too specific to reuse
+_COMMON_GRAM_DF = 0.5  # n-grams in more than this share of questions are left out of the index
+_VOTE_SHARPNESS = 4  # votes weigh similarity ** this, so distant neighbours barely count
+
+_model = None  # AnswerModel, False if unavailable
+
+
+def _grams(question):
+    text = f" {canonical_question(question)} "
+    return Counter(text[i:i + n] for n in _NGRAM_SIZES for i in range(len(text) - n + 1))
+
+
+def training_examples(cache):
+    """[{"kind", "question", "answer", "options"?}] from text/select cache entries with short non-empty answers."""
+    examples = []
+    for key, answer in cache.items():
+        parts = key.split("::", 2)
+        if len(parts) < 2 or parts[0] not in ("text", "select") or not isinstance(answer, str) or not answer.strip():
+            continue
+        kind, question = parts[0], parts[1]
+        if "(Validation:" in question:
+            question = question[:question.index("(Validation:")]
+        example = {"kind": kind, "question": question, "answer": answer.strip()}
+        if kind == "text" and len(example["answer"]) > _MAX_TEXT_ANSWER_LEN:
+            continue
+        if kind == "select" and len(parts) == 3 and parts[2].startswith("["):
+            try:
+                example["options"] = ast.literal_eval(parts[2])
+            except (ValueError, SyntaxError):
+                pass
+        examples.append(example)
+    return examples
+
+
+def training_hash(examples):
+    """Identity of a training set, stored with the model to tell when the cache has moved on."""
+    data = json.dumps(sorted((e["kind"], e["question"], e["answer"]) for e in examples), ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class AnswerModel:
+    def __init__(self, examples, idf=None):
+        self.examples = examples
+        if idf is None:
+            df = Counter(g for e in examples for g in _grams(e["question"]))
+            idf = {g: math.log((1 + len(examples)) / (1 + n)) + 1 for g, n in df.items()}
+        self.idf = idf
+        self._index = defaultdict(list)  # n-gram -> [(example index, weight)]
+        max_df = max(1, int(len(examples) * _COMMON_GRAM_DF))
+        for i, example in enumerate(examples):
+            for gram, weight in self._vector(example["question"]).items():
+                self._index[gram].append((i, weight))
+        self._index = {g: postings for g, postings in self._index.items() if len(postings) <= max_df}
+
+    def _vector(self, question):
+        vector = {g: tf * self.idf[g] for g, tf in _grams(question).items() if g in self.idf}
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        return {g: w / norm for g, w in vector.items()} if norm else {}
+
+    def neighbours(self, question, kind, k=_NEIGHBOURS):
+        """Return [(similarity, example)] of the k most similar training questions of this kind."""
+        scores = defaultdict(float)
+        for gram, weight in self._vector(question).items():
+            for i, doc_weight in self._index.get(gram, ()):
+                scores[i] += weight * doc_weight
+        ranked = sorted(((s, self.examples[i]) for i, s in scores.items() if self.examples[i]["kind"] == kind),
+                        key=lambda x: -x[0])
+        return ranked[:k]
+
+    def predict(self, question, options=None):
+        """
+        Return (answer, confidence): the similarity-weighted vote of the nearest answered questions.
+        With options, neighbour answers are mapped onto them first. (None, 0.0) if nothing is close.
+        """
+        votes = defaultdict(float)
+        best = {}
+        for similarity, example in self.neighbours(question, "select" if options is not None else "text"):
+            answer = match_option(example["answer"], options) if options is not None else example["answer"]
+            if not answer:
+                continue
+            vote = answer if options is not None else normalize_option(answer)
+            votes[vote] += similarity ** _VOTE_SHARPNESS
+            best.setdefault(vote, (similarity, answer))
+        if not votes:
+            return None, 0.0
+        winner = max(votes, key=votes.get)
+        similarity, answer = best[winner]
+        # as close as the closest supporting question, discounted by disagreeing neighbours
+        return answer, similarity * votes[winner] / sum(votes.values())
+
+    def to_json(self):
+        return {
+            "trained_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "training_hash": training_hash(self.examples),
+            "idf": self.idf,
+            "examples": self.examples,
+        }
+
+
+def train(cache=None, model_file=ANSWER_MODEL_FILE, examples=None):
+    """Build the model from the answer cache (or the given training examples) and save it."""
+    if examples is None:
+        if cache is None:
+            from utils.cache_manager import get_full_cache
+            cache = get_full_cache()
+        examples = training_examples(cache)
+    model = AnswerModel(examples)
+    tmp_file = f"{model_file}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(model.to_json(), f)
+    os.replace(tmp_file, model_file)
+    print(f"Answer model trained on {len(model.examples)} answers -> {model_file}")
+    return model
+
+
+def _load_model():
+    """Load the saved model, retraining it first if the cached answers changed since it was trained."""
+    global _model
+    from utils.cache_manager import get_full_cache
+
+    _model = False
+    examples = training_examples(get_full_cache())
+    data = None
+    if os.path.exists(ANSWER_MODEL_FILE):
+        try:
+            with open(ANSWER_MODEL_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Failed to load answer model: {e}")
+    if data and data.get("training_hash") == training_hash(examples):
+        _model = AnswerModel(data["examples"], data["idf"])
+        print(f"Loaded answer model ({len(_model.examples)} answers, trained {data.get('trained_at')})")
+        return
+    if not examples:
+        return
+    print("Cached answers changed since the answer model was trained, retraining it...")
+    try:
+        _model = train(examples=examples)
+    except Exception as e:
+        print(f"Failed to train answer model: {e}")
+
+
+def predict_answer(question, options=None, validation=None):
+    """
+    Return the model's answer if it is confident enough, else None.
+    Not used with validation: the field rejected an answer, and the model would give the same one again.
+    """
+    if not ANSWER_MODEL_ENABLED or not question or validation:
+        return None
+    if _model is None:
+        _load_model()
+    if not _model:
+        return None
+    answer, confidence = _model.predict(question, options)
+    if answer is None or confidence < ANSWER_MODEL_MIN_CONFIDENCE:
+        return None
+    print(f"Answer model: {answer} (confidence {confidence:.2f})")
+    return answer
+
+
+def report(cache, test_fraction=0.2, seed=1, thresholds=(0.7, 0.8, 0.85, 0.9, 0.95)):
+    """Train on part of the cache and print coverage, accuracy and latency on the held-out rest."""
+    examples = training_examples(cache)
+    random.Random(seed).shuffle(examples)
+    split = int(len(examples) * (1 - test_fraction))
+    train_set, test_set = examples[:split], examples[split:]
+    if not train_set or not test_set:
+        print(f"Not enough cached answers to evaluate ({len(examples)})")
+        return
+
+    started = time.perf_counter()
+    model = AnswerModel(train_set)
+    train_ms = (time.perf_counter() - started) * 1000
+    results, latencies = [], []
+    for example in test_set:
+        options = example.get("options") if example["kind"] == "select" else None
+        if example["kind"] == "select" and options is None:
+            continue  # option list only known by digest
+        started = time.perf_counter()
+        answer, confidence = model.predict(example["question"], options)
+        latencies.append((time.perf_counter() - started) * 1000)
+        correct = answer is not None and normalize_option(answer) == normalize_option(example["answer"])
+        results.append((example["kind"], confidence, correct))
+
+    latencies.sort()
+    print(f"Trained on {len(train_set)} answers in {train_ms:.0f} ms, evaluated on {len(results)} held-out answers")
+    print(f"Latency per prediction: mean {sum(latencies) / len(latencies):.2f} ms, "
+          f"p95 {latencies[int(len(latencies) * 0.95)]:.2f} ms")
+    for threshold in thresholds:
+        for kind in ("text", "select"):
+            answered = [correct for k, confidence, correct in results if k == kind and confidence >= threshold]
+            total = sum(1 for k, _, _ in results if k == kind)
+            if not total:
+                continue
+            accuracy = f"{sum(answered) / len(answered):.1%}" if answered else "-"
+            marker = " <- ANSWER_MODEL_MIN_CONFIDENCE" if threshold == ANSWER_MODEL_MIN_CONFIDENCE else ""
+            print(f"  confidence >= {threshold:.2f} {kind:6}: answers {len(answered)}/{total} "
+                  f"({len(answered) / total:.0%}), accuracy {accuracy}{marker}")
+
+
+if __name__ == "__main__":
+    from utils.cache_manager import get_full_cache
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "report"
+    if command == "train":
+        train(get_full_cache())
+    elif command == "report":
+        report(get_full_cache(), float(sys.argv[2]) if len(sys.argv) > 2 else 0.2)
+    else:
+        sys.exit("Usage: answer_model.py train | report [test_fraction]")
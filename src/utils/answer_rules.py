@@ -0,0 +1,125 @@
+"""Rule engine answering common screening questions straight from the candidate profile."""
+import re
+
+from utils.candidate_profile import get_candidate_profile
+from utils.option_matcher import match_option
+from utils.question_normalizer import canonical_question, normalize_skill
+
+
+def _yes_no(value):
+    if isinstance(value, bool):
+        return "Yes" if value else "No"
+    return None
+
+
+def _number(value):
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return str(int(value)) if float(value).is_integer() else str(value)
+    return None
+
+
+def _text(value):
+    return value.strip() if isinstance(value, str) and value.strip() else None
+
+
+def _years_with_skill(profile, match):
+    skill = match.group(1)
+    if skill == "total":
+        return _number(profile.get("total_experience_years"))
+    skills = profile.get("skills") or {}
+    years = skills.get(skill)
+    if years is None:
+        # "reactjs" vs "react", "spring boot" vs "springboot"
+        compact = skill.replace(" ", "").removesuffix("js")
+        years = next((v for k, v in skills.items()
+                      if k.replace(" ", "").removesuffix("js") == compact), None)
+    return _number(years)
+
+
+def _in_countries(countries, place):
+    if not isinstance(countries, list):
+        return False
+    return any(normalize_skill(c) and normalize_skill(c) in place for c in countries if isinstance(c, str))
+
+
+def _authorized_in(profile, match):
+    # "No" only when the profile says so explicitly; a country missing from both lists is unknown
+    authorization = profile.get("work_authorization") or {}
+    place = match.group(1)
+    if _in_countries(authorization.get("authorized_countries"), place):
+        return "Yes"
+    if _in_countries(authorization.get("unauthorized_countries"), place):
+        return "No"
+    return None
+
+
+# Place a question is about: "... sponsorship to work in the united states" -> "united states"
+_PLACE = re.compile(r"\bin (?!order\b|the future\b|future\b)(?:the )?([a-z][a-z ]*)$")
+
+
+def _sponsorship(profile, match):
+    # requires_sponsorship holds for the authorized countries; for any other named country let AI decide
+    authorization = profile.get("work_authorization") or {}
+    place = _PLACE.search(match.string)
+    if place and not _in_countries(authorization.get("authorized_countries"), place.group(1)):
+        return None
+    return _yes_no(authorization.get("requires_sponsorship"))
+
+
+def _contact(name):
+    return lambda profile, match: _text((profile.get("contacts") or {}).get(name))
+
+
+def _field(*path, kind=_text):
+    def resolve(profile, match):
+        value = profile
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+        return kind(value)
+    return resolve
+
+
+# (pattern on the canonical question, resolver(profile, match) -> answer or None); first answer wins
+RULES = [
+    (r"^years experience (.+)$", _years_with_skill),
+    (r"^(?:are you )?authorized to work (?:in )?(.+?)(?: without .*)?$", _authorized_in),
+    (r"\b(?:require|required|need|needs)\b.*\bsponsorship\b|\bsponsorship\b.*\brequired?\b", _sponsorship),
+    (r"^(?:your )?(?:mobile |cell )?phone number$", _contact("phone_number")),
+    (r"^phone country code$|^country code$", _contact("phone_country")),
+    (r"^e ?mail(?: address)?$", _contact("email")),
+    (r"^(?:your )?linkedin(?: profile)?(?: url| link)?$", _contact("linkedin")),
+    (r"^(?:your )?github(?: profile)?(?: url| link)?$", _contact("github")),
+    (r"^(?:personal )?(?:website|portfolio)(?: url| link)?$", _contact("website")),
+    (r"^first name$", _field("first_name")),
+    (r"^(?:last name|surname|family name)$", _field("last_name")),
+    (r"^(?:full name|name)$", _field("full_name")),
+    (r"^(?:current )?city$|^location city$", _field("location", "city")),
+    (r"^nationality$|^citizenship$", _field("nationality")),
+    (r"^notice period(?: in days)?$", _field("notice_period_days", kind=_number)),
+    (r"^expected (?:annual |monthly )?(?:salary|compensation)", _field("expected_salary")),
+    (r"^current (?:annual |monthly )?(?:salary|compensation)", _field("current_salary")),
+    (r"\b(?:willing|open) to relocate\b", _field("willing_to_relocate", kind=_yes_no)),
+    (r"^(?:highest )?(?:level of )?education(?: level)?$", _field("highest_education")),
+]
+RULES = [(re.compile(p), resolver) for p, resolver in RULES]
+
+
+def answer_from_profile(question, options=None):
+    """Return an answer from the candidate profile, mapped onto options if given, or None if no rule applies."""
+    profile = get_candidate_profile()
+    if not profile or not question:
+        return None
+    canonical = canonical_question(question)
+    for pattern, resolver in RULES:
+        match = pattern.search(canonical)
+        if not match:
+            continue
+        answer = resolver(profile, match)
+        if answer is None:
+            return None
+        if options is not None:
+            return match_option(answer, options)
+        return answer
+    return None
@@ -0,0 +1,195 @@
+"""Check and coerce text answers against a field's constraints before typing, to avoid failed Next clicks."""
+import atexit
+import math
+import re
+
+from config import FIELD_CONSTRAINTS_FILE, FIELD_CONSTRAINTS_LOG_FILE
+from utils.cache_manager import new_store
+from utils.question_normalizer import canonical_question
+
+_NUMBER = r"-?\d+(?:\.\d+)?"
+_EMAIL = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+_URL = re.compile(r"https?://\S+|(?:www\.)?[\w-]+(?:\.[\w-]+)+(?:/\S*)?")
+
+# canonical question -> constraints learned from LinkedIn error texts
+_learned = None
+_store = None
+
+
+def _to_number(text):
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return None
+
+
+def _from_text(text):
+    """Constraints stated in an error or hint text, e.g. "Enter a whole number between 0 and 99"."""
+    text = (text or "").lower().replace(",", "")
+    constraints = {}
+    if re.search(r"whole number|integer", text):
+        constraints.update(numeric=True, integer=True)
+    elif re.search(r"decimal number|\bnumber\b|numeric", text) and "phone" not in text:
+        constraints["numeric"] = True
+    match = re.search(rf"between ({_NUMBER}) and ({_NUMBER})", text)
+    if match:
+        constraints.update(min=float(match.group(1)), max=float(match.group(2)))
+    match = re.search(rf"(?:larger|greater|more) than ({_NUMBER})", text)
+    if match:
+        constraints["min_exclusive"] = float(match.group(1))
+    match = re.search(rf"(?:less|smaller|fewer) than ({_NUMBER})(?![\d.]| characters?)", text)
+    if match:
+        constraints["max_exclusive"] = float(match.group(1))
+    match = re.search(r"(\d+) characters? or (?:fewer|less)|(?:less|fewer) than (\d+) characters|"
+                      r"(?:maximum|max|at most|up to) (?:of )?(\d+) characters", text)
+    if match:
+        limit = int(next(g for g in match.groups() if g))
+        constraints["max_length"] = limit - 1 if "than" in match.group(0) else limit
+    if "email" in text:
+        constraints["format"] = "email"
+    elif "phone" in text:
+        constraints["format"] = "tel"
+    elif re.search(r"\burl\b|website|link", text):
+        constraints["format"] = "url"
+    return constraints
+
+
+def field_constraints(field):
+    """Constraints from the DOM attributes extract_form_fields collected for a text field."""
+    attrs = field.get("constraints") or {}
+    constraints = {}
+    input_type, input_mode = attrs.get("inputType", ""), attrs.get("inputMode", "")
+    if input_type == "number" or attrs.get("numeric") or input_mode == "numeric":
+        constraints.update(numeric=True, integer=input_mode == "numeric")
+    elif input_mode == "decimal":
+        constraints["numeric"] = True
+    if input_type in ("email", "tel", "url"):
+        constraints["format"] = input_type
+    for key in ("min", "max"):
+        value = _to_number(attrs.get(key))
+        if value is not None:
+            constraints[key] = value
+    if attrs.get("maxLength"):
+        constraints["max_length"] = int(attrs["maxLength"])
+    if attrs.get("pattern"):
+        constraints["pattern"] = attrs["pattern"]
+    for hint in attrs.get("hints", []):
+        constraints.update(_from_text(hint))
+    return constraints
+
+
+def _load():
+    global _learned, _store
+    _store = new_store("field_constraints", FIELD_CONSTRAINTS_FILE, FIELD_CONSTRAINTS_LOG_FILE)
+    try:
+        _learned = _store.load()
+    except Exception as e:
+        print(f"Failed to load field constraints: {e}")
+        _learned = {}
+    atexit.register(_store.flush)
+
+
+def learn_from_error(question, error):
+    """Remember the constraints an error text reveals for this question."""
+    constraints = _from_text(error)
+    if not constraints or not question:
+        return
+    if _learned is None:
+        _load()
+    key = canonical_question(question)
+    merged = dict(_learned.get(key, {}), **constraints)
+    if merged != _learned.get(key):
+        print(f"Learned constraints for '{key}': {merged}")
+        _learned[key] = merged
+        _store.set(key, merged)
+
+
+def get_constraints(question, field=None):
+    """Constraints for a field: learned for its question, overridden by what the DOM says now."""
+    if _learned is None:
+        _load()
+    constraints = dict(_learned.get(canonical_question(question), {}) if question else {})
+    if field:
+        constraints.update(field_constraints(field))
+        if field.get("error"):
+            constraints.update(_from_text(field["error"]))
+    return constraints
+
+
+def _coerce_number(answer, constraints):
+    match = re.search(_NUMBER, answer.replace(",", ""))
+    if not match:
+        return None
+    value = float(match.group(0))
+    low = constraints.get("min", -math.inf)
+    high = constraints.get("max", math.inf)
+    step = 1 if constraints.get("integer") else 0.1
+    if "min_exclusive" in constraints:
+        low = max(low, constraints["min_exclusive"] + step)
+    if "max_exclusive" in constraints:
+        high = min(high, constraints["max_exclusive"] - step)
+    if constraints.get("integer"):
+        value, low, high = round(value), math.ceil(low), math.floor(high)
+    if not low <= value <= high:
+        # "50 years" on a 0-30 field is a wrong answer, not a formatting issue: ask again instead of clamping
+        print(f"Answer {value:g} is outside the allowed range {low:g}-{high:g}")
+        return None
+    return str(int(value)) if float(value).is_integer() else f"{value:g}"
+
+
+def coerce_answer(answer, constraints):
+    """
+    Return answer adjusted to satisfy constraints ("5 years" -> "5" for a whole number field,
+    truncated to max length, ...), or None if it cannot be made valid.
+    """
+    if answer is None:
+        return None
+    answer = str(answer).strip()
+    if not answer or not constraints:
+        return answer
+    if constraints.get("numeric"):
+        answer = _coerce_number(answer, constraints)
+        if answer is None:
+            return None
+    fmt = constraints.get("format")
+    if fmt == "email":
+        match = _EMAIL.search(answer)
+        answer = match.group(0) if match else None
+    elif fmt == "tel":
+        digits = re.sub(r"[^\d+]", "", answer)
+        answer = digits if len(re.sub(r"\D", "", digits)) >= 6 else None
+    elif fmt == "url":
+        match = _URL.search(answer)
+        answer = match.group(0) if match else None
+    if answer is None:
+        return None
+    max_length = constraints.get("max_length")
+    if max_length and len(answer) > max_length:
+        cut = answer[:max_length]
+        answer = cut[:cut.rfind(" ")].rstrip(" ,.;:") if " " in cut else cut
+    pattern = constraints.get("pattern")
+    if pattern:
+        try:
+            if not re.fullmatch(pattern, answer):
+                return None
+        except re.error:
+            pass
+    return answer
+
+
+def describe_constraints(constraints):
+    """Constraints as a validation hint for the AI prompt."""
+    parts = []
+    if constraints.get("numeric"):
+        parts.append("a whole number" if constraints.get("integer") else "a number")
+    for key, text in (("min", "at least"), ("max", "at most"), ("min_exclusive", "greater than"),
+                      ("max_exclusive", "less than")):
+        if key in constraints:
+            parts.append(f"{text} {constraints[key]:g}")
+    if constraints.get("format"):
+        parts.append(f"a valid {constraints['format']}")
+    if constraints.get("max_length"):
+        parts.append(f"at most {constraints['max_length']} characters")
+    if constraints.get("pattern"):
+        parts.append(f"matching the pattern {constraints['pattern']}")
+    return ("Answer must be " + ", ".join(parts)) if parts else ""
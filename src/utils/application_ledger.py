@@ -0,0 +1,158 @@
+"""
+Append-only ledger of every job processed: one record per job and search run with its outcome and timings.
+JSONL file rotated (gzipped) past JOB_LEDGER_MAX_BYTES with an in-memory job id -> offsets index, or a table in
+the shared SQLite database.
+"""
+import datetime
+import gzip
+import json
+import os
+import sys
+import threading
+
+from config import JOB_LEDGER_FILE, JOB_LEDGER_MAX_BYTES, STORAGE_BACKEND
+from utils.csv_utils import export_csv
+from utils.jsonl_utils import JsonlWriter, iter_jsonl, rotated_files
+from utils.sqlite_store import connect
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS job_ledger (
+    seq         INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id      TEXT,
+    run_id      TEXT,
+    recorded_at TEXT NOT NULL,
+    record      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS job_ledger_job_id ON job_ledger (job_id);
+CREATE INDEX IF NOT EXISTS job_ledger_run_id ON job_ledger (run_id);
+"""
+
+_ledger = None
+
+
+class JsonlLedger:
+    """Records appended as JSON lines, written through as each job finishes; the job id index is built on the first
+    lookup."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._writer = JsonlWriter(path, flush_every=1, max_bytes=JOB_LEDGER_MAX_BYTES, compress=True)
+        self._index = None  # job_id -> [(file path, byte offset), ...], rotated parts included
+        self._lock = threading.Lock()
+
+    def _build_index(self):
+        self._index = {}
+        for path in rotated_files(self.path) + [self.path]:
+            if not os.path.exists(path):
+                continue
+            opener = gzip.open if path.endswith(".gz") else open
+            with opener(path, "rb") as f:
+                offset = 0
+                for line in f:
+                    try:
+                        job_id = json.loads(line).get("job_id")
+                    except ValueError:
+                        job_id = None  # torn or hand-edited line
+                    if job_id:
+                        self._index.setdefault(job_id, []).append((path, offset))
+                    offset += len(line)
+
+    def append(self, record):
+        with self._lock:
+            offset = self._writer.write(record)
+            if self._index is None:
+                return
+            if offset == 0:
+                # the file was rotated (or is new): offsets into the old file moved to a rotated part, rebuild lazily
+                self._index = None
+            elif record.get("job_id"):
+                self._index.setdefault(record["job_id"], []).append((self.path, offset))
+
+    def find(self, job_id):
+        with self._lock:
+            if self._index is None:
+                self._build_index()
+            locations = list(self._index.get(job_id, ()))
+        records = []
+        for path in dict.fromkeys(path for path, _ in locations):
+            # rotated parts are gzipped: seeking decompresses up to the offset, so read each part once
+            opener = gzip.open if path.endswith(".gz") else open
+            with opener(path, "rb") as f:
+                for offset in (o for p, o in locations if p == path):
+                    f.seek(offset)
+                    records.append(json.loads(f.readline()))
+        return records
+
+    def iter_records(self):
+        return iter_jsonl(self.path)
+
+
+class SqliteLedger:
+    def __init__(self):
+        self._conn = connect()
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def append(self, record):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO job_ledger (job_id, run_id, recorded_at, record) VALUES (?, ?, ?, ?)",
+                (record.get("job_id"), record.get("run_id"), record["recorded_at"],
+                 json.dumps(record, ensure_ascii=False)))
+
+    def find(self, job_id):
+        with self._lock:
+            rows = self._conn.execute("SELECT record FROM job_ledger WHERE job_id = ? ORDER BY seq",
+                                      (job_id,)).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def iter_records(self):
+        # own connection, so appends are not blocked while a long export streams
+        conn = connect()
+        try:
+            for (record,) in conn.execute("SELECT record FROM job_ledger ORDER BY seq"):
+                yield json.loads(record)
+        finally:
+            conn.close()
+
+
+def _get_ledger():
+    global _ledger
+    if _ledger is None:
+        _ledger = SqliteLedger() if STORAGE_BACKEND == "sqlite" else JsonlLedger(JOB_LEDGER_FILE)
+    return _ledger
+
+
+def record_job(record):
+    """Append a job record ({"job_id", "run_id", "title", "company", "status", "timings", ...})."""
+    record = dict(record, recorded_at=datetime.datetime.now(datetime.timezone.utc).isoformat())
+    try:
+        _get_ledger().append(record)
+    except Exception as e:
+        print(f"Failed to record job in ledger: {e}")
+
+
+def get_job_records(job_id):
+    """Every record of a job id, oldest first."""
+    return _get_ledger().find(str(job_id)) if job_id else []
+
+
+def get_last_job_record(job_id):
+    records = get_job_records(job_id)
+    return records[-1] if records else None
+
+
+def iter_job_records():
+    """Stream every ledger record, oldest first."""
+    return _get_ledger().iter_records()
+
+
+if __name__ == "__main__":
+    # Export the ledger with constant memory: application_ledger.py export <file.csv>
+    if len(sys.argv) != 3 or sys.argv[1] != "export":
+        sys.exit("Usage: application_ledger.py export <file.csv>")
+    count = export_csv(sys.argv[2], iter_job_records(),
+                       ["recorded_at", "run_id", "job_id", "title", "company", "prefilter_score", "relevancy",
+                        "relevancy_source", "applied", "status", "recruiter_status", "timings.extract",
+                        "timings.relevancy", "timings.form", "timings.recruiter", "timings.total", "url"])
+    print(f"Exported {count} job records to {sys.argv[2]}")
@@ -1,62 +1,261 @@
-import json
-import os
+import atexit
+import threading
+import time
 
-from config import CACHE_FILE
+from config import CACHE_FILE, CACHE_LOG_FILE, CACHE_META_FILE, CACHE_META_LOG_FILE, CACHE_FSYNC_EVERY, \
+    CACHE_FSYNC_INTERVAL, CACHE_COMPACT_MIN_OPS, CACHE_MAX_ENTRIES, CACHE_TTL_DAYS, STORAGE_BACKEND
+from utils.log_store import LogStore
+from utils.sqlite_store import SqliteStore
 
 _prompt_cache = {}
+_store = None
+_loaded = False  # loaded on first use, not at import
+_load_lock = threading.Lock()
+
+# Per-entry {"created": epoch, "used": epoch}, persisted in its own store
+_meta = {}
+_meta_store = None
+_TOUCH_PERSIST_SECONDS = 3600  # last-used times are persisted at most hourly per entry
+
+# Secondary indexes, kept in step with _prompt_cache
+_ques_index = {}  # question -> {cache key: None}, most recently written key last
+_namespace_views = {}  # "text" / "select" -> {cache key: answer}, least recently used first
+_qna_cache = {}  # question -> answer of its most recently written key
+
+# Per-namespace counters for the current run
+_stats = {}
+
+def _split_key(key):
+    """Split a "type::question[::options]" cache key into (namespace, question)."""
+    parts = key.split("::", 2)
+    if len(parts) < 2:
+        return "", key
+    return parts[0], parts[1]
+
+def _index_add(key, value):
+    namespace, ques = _split_key(key)
+    keys = _ques_index.setdefault(ques, {})
+    keys.pop(key, None)
+    keys[key] = None
+    view = _namespace_views.setdefault(namespace, {})
+    view.pop(key, None)
+    view[key] = value
+    _qna_cache[ques] = value
+
+def _index_remove(key):
+    namespace, ques = _split_key(key)
+    _namespace_views.get(namespace, {}).pop(key, None)
+    keys = _ques_index.get(ques)
+    if keys is None:
+        return
+    keys.pop(key, None)
+    if keys:
+        _qna_cache[ques] = _prompt_cache[next(reversed(keys))]
+    else:
+        del _ques_index[ques]
+        _qna_cache.pop(ques, None)
+
+def _rebuild_indexes():
+    _ques_index.clear()
+    _namespace_views.clear()
+    _qna_cache.clear()
+    for key in sorted(_prompt_cache, key=lambda k: _meta.get(k, {}).get("used", 0)):
+        _index_add(key, _prompt_cache[key])
+
+def _stats_for(namespace):
+    return _stats.setdefault(namespace, {"hits": 0, "misses": 0, "inserts": 0, "evictions": 0, "expired": 0})
+
+def new_store(name, snapshot_file, log_file, indent=None):
+    """Key/value store for the configured STORAGE_BACKEND (a SQLite namespace, or JSON snapshot + write log)."""
+    if STORAGE_BACKEND == "sqlite":
+        return SqliteStore(name)
+    return LogStore(snapshot_file, log_file,
+                    fsync_every=CACHE_FSYNC_EVERY,
+                    fsync_interval=CACHE_FSYNC_INTERVAL,
+                    compact_min_ops=CACHE_COMPACT_MIN_OPS,
+                    indent=indent)
+
+def _ensure_loaded():
+    if not _loaded:
+        with _load_lock:
+            if not _loaded:
+                load_prompt_cache()
 
 def load_prompt_cache():
+    """Load the cache from the configured store (JSON snapshot + write log, or shared SQLite)."""
     print("Loading prompt cache...")
-    global _prompt_cache
-    if os.path.exists(CACHE_FILE):
-        try:
-            with open(CACHE_FILE, 'r') as f:
-                _prompt_cache = json.load(f)
-        except Exception as e:
-            print(f"Failed to load prompt cache: {e}")
-            _prompt_cache = {}
+    global _prompt_cache, _store, _meta, _meta_store, _loaded
+    for store in (_store, _meta_store):
+        if store:
+            store.close()
+    _store = new_store("qnas_cache", CACHE_FILE, CACHE_LOG_FILE, indent=4)
+    _meta_store = new_store("qnas_cache_meta", CACHE_META_FILE, CACHE_META_LOG_FILE)
+    try:
+        _prompt_cache = _store.load()
+        _meta = _meta_store.load()
+    except Exception as e:
+        print(f"Failed to load prompt cache: {e}")
+        _prompt_cache = {}
+        _meta = {}
+    _rebuild_indexes()
+    _purge_expired_and_evict()
+    _compact_if_needed()
+    _loaded = True
 
 def save_prompt_cache():
+    """Compact: rewrite the full snapshot (empty answers first) and truncate the log."""
     try:
         sorted_items = sorted(_prompt_cache.items(), key=lambda x: x[1] != "")
         sorted_cache = dict(sorted_items)
-        with open(CACHE_FILE, 'w') as f:
-            json.dump(sorted_cache, f, indent=4)
+        _store.compact(sorted_cache)
+        _meta_store.compact({k: v for k, v in _meta.items() if k in _prompt_cache})
     except Exception as e:
         print(f"Failed to save prompt cache: {e}")
 
+def _compact_if_needed():
+    if _store.needs_compaction(len(_prompt_cache)) or _meta_store.needs_compaction(len(_meta)):
+        save_prompt_cache()
+
+def flush_prompt_cache():
+    for store in (_store, _meta_store):
+        if store:
+            store.flush()
+
+def _is_expired(key, now):
+    ttl_days = CACHE_TTL_DAYS.get(_split_key(key)[0])
+    created = _meta.get(key, {}).get("created")
+    return bool(ttl_days) and created is not None and now - created > ttl_days * 86400
+
+def _touch(key, now):
+    """Mark an entry as most recently used."""
+    namespace = _split_key(key)[0]
+    view = _namespace_views.get(namespace, {})
+    view[key] = view.pop(key, _prompt_cache[key])
+    meta = _meta.setdefault(key, {"created": now, "used": 0})
+    if now - meta.get("used", 0) > _TOUCH_PERSIST_SECONDS:
+        meta["used"] = now
+        _meta_store.set(key, meta)
+
+def _delete_entry(key):
+    del _prompt_cache[key]
+    _index_remove(key)
+    _store.delete(key)
+    if _meta.pop(key, None) is not None:
+        _meta_store.delete(key)
+
+def _evict_if_needed(namespace):
+    """Drop least recently used entries while the namespace is over its CACHE_MAX_ENTRIES limit."""
+    limit = CACHE_MAX_ENTRIES.get(namespace)
+    view = _namespace_views.get(namespace, {})
+    while limit and len(view) > limit:
+        _delete_entry(next(iter(view)))
+        _stats_for(namespace)["evictions"] += 1
+
+def _purge_expired_and_evict():
+    now = time.time()
+    expired = [key for key in _prompt_cache if _is_expired(key, now)]
+    for key in expired:
+        _delete_entry(key)
+    if expired:
+        print(f"Removed {len(expired)} expired cache entries")
+    for namespace in list(_namespace_views):
+        _evict_if_needed(namespace)
+
 def get_from_cache(key, default=None):
-    return _prompt_cache.get(key, default)
+    _ensure_loaded()
+    namespace = _split_key(key)[0]
+    stats = _stats_for(namespace)
+    now = time.time()
+    if key not in _prompt_cache and getattr(_store, "shared", False):
+        # another process may have answered it since we loaded
+        value = _store.get(key)
+        if value is not None:
+            _prompt_cache[key] = value
+            _meta[key] = _meta_store.get(key) or {"created": now, "used": now}
+            _index_add(key, value)
+    if key in _prompt_cache:
+        if not _is_expired(key, now):
+            stats["hits"] += 1
+            _touch(key, now)
+            return _prompt_cache[key]
+        _delete_entry(key)
+        stats["expired"] += 1
+    stats["misses"] += 1
+    return default
+
+def is_cached(key):
+    """True if key holds a live entry. Does not count as a lookup or refresh its LRU position."""
+    _ensure_loaded()
+    return key in _prompt_cache and not _is_expired(key, time.time())
 
 def set_to_cache(key, value):
+    _ensure_loaded()
+    now = time.time()
     _prompt_cache[key] = value
-    save_prompt_cache()
+    _index_add(key, value)
+    _store.set(key, value)
+    _meta[key] = {"created": now, "used": now}
+    _meta_store.set(key, _meta[key])
+    namespace = _split_key(key)[0]
+    _stats_for(namespace)["inserts"] += 1
+    _evict_if_needed(namespace)
+    _compact_if_needed()
 
 def remove_from_cache(key):
+    _ensure_loaded()
     if key in _prompt_cache:
-        del _prompt_cache[key]
-        save_prompt_cache()
+        _delete_entry(key)
+        _compact_if_needed()
+
+def get_cache_keys_by_ques(ques):
+    """Return the cache keys stored for a question, most recently written last."""
+    _ensure_loaded()
+    return list(_ques_index.get(ques, ()))
 
 def remove_by_ques_from_cache(ques):
-    for key in list(_prompt_cache.keys()):
-        if key.split("::")[1] == ques:
-            del _prompt_cache[key]
-    save_prompt_cache()
+    _ensure_loaded()
+    for key in get_cache_keys_by_ques(ques):
+        _delete_entry(key)
+    _compact_if_needed()
 
 
 def clear_cache():
+    _ensure_loaded()
     _prompt_cache.clear()
+    _meta.clear()
+    _rebuild_indexes()
     save_prompt_cache()
 
 def get_full_cache():
+    _ensure_loaded()
     return _prompt_cache
 
+def get_namespace_cache(namespace):
+    """Return the live {cache key: answer} view for a namespace such as "text" or "select"."""
+    _ensure_loaded()
+    return _namespace_views.get(namespace, {})
+
 def get_full_qna_cache():
-    qna_cache = {}
-    for key, val in _prompt_cache.items():
-        ques = key.split("::")[1]
-        qna_cache[ques] = val
-    return qna_cache
-
-# Load cache at module import
-load_prompt_cache()
\ No newline at end of file
+    """Return the live {question: answer} view. Treat as read-only."""
+    _ensure_loaded()
+    return _qna_cache
+
+def get_cache_stats():
+    """Return {namespace: {hits, misses, inserts, evictions, expired, size, limit}} for this run."""
+    stats = {}
+    for namespace in sorted(set(_stats) | set(_namespace_views)):
+        stats[namespace] = dict(_stats_for(namespace),
+                                size=len(_namespace_views.get(namespace, {})),
+                                limit=CACHE_MAX_ENTRIES.get(namespace))
+    return stats
+
+def print_cache_stats():
+    print("Prompt cache stats:")
+    for namespace, st in get_cache_stats().items():
+        lookups = st["hits"] + st["misses"]
+        hit_rate = f"{st['hits'] / lookups:.0%}" if lookups else "-"
+        print(f"  {namespace or '<none>'}: size {st['size']}/{st['limit'] or 'unbounded'}, "
+              f"hits {st['hits']}, misses {st['misses']} (hit rate {hit_rate}, AI calls saved {st['hits']}), "
+              f"inserts {st['inserts']}, evictions {st['evictions']}, expired {st['expired']}")
+
+atexit.register(flush_prompt_cache)
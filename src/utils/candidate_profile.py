@@ -0,0 +1,117 @@
+"""
+Structured candidate profile compiled once from the resume and qna_list, used for rule-based answers.
+It is rebuilt when the resume, model or PROFILE_STRUCTURE changes, or when the user edits qna_list answers; the
+qna_list file itself is not hashed, as the app appends every new answer to it.
+"""
+import datetime
+import hashlib
+import json
+import os
+
+from config import CANDIDATE_PROFILE_FILE, OPENAI_MODEL
+from utils.common_utils import file_sha256
+from utils.question_normalizer import normalize_skill
+
+PROFILE_STRUCTURE = {
+    "first_name": "str",
+    "last_name": "str",
+    "full_name": "str",
+    "contacts": {
+        "email": "str",
+        "phone_country": "str:<country name and dial code, e.g. 'Singapore (+65)'>",
+        "phone_number": "str:<phone number without country code>",
+        "linkedin": "str:<profile url>",
+        "github": "str:<profile url>",
+        "website": "str:<portfolio url>"
+    },
+    "location": {"city": "str", "country": "str"},
+    "nationality": "str",
+    "total_experience_years": "int",
+    "skills": {"<skill name>": "int:<years of experience with it>"},
+    "work_authorization": {
+        "authorized_countries": ["str:<countries the candidate may work in without sponsorship>"],
+        "unauthorized_countries": ["str:<countries the candidate explicitly says they may not work in>"],
+        "requires_sponsorship": "bool"
+    },
+    "notice_period_days": "int",
+    "expected_salary": "str",
+    "current_salary": "str",
+    "willing_to_relocate": "bool",
+    "highest_education": "str:<e.g. Bachelor's Degree>"
+}
+
+_profile = None
+
+
+def _source_hash(resume_path):
+    """Identity of everything the profile is compiled from."""
+    parts = [file_sha256(resume_path), OPENAI_MODEL, json.dumps(PROFILE_STRUCTURE, sort_keys=True)]
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def _normalize(profile):
+    skills = profile.get("skills")
+    if isinstance(skills, dict):
+        profile["skills"] = {normalize_skill(k): v for k, v in skills.items() if k}
+    return profile
+
+
+def load_candidate_profile():
+    global _profile
+    _profile = {}
+    if os.path.exists(CANDIDATE_PROFILE_FILE):
+        try:
+            with open(CANDIDATE_PROFILE_FILE, "r", encoding="utf-8") as f:
+                _profile = json.load(f)
+        except Exception as e:
+            print(f"Failed to load candidate profile: {e}")
+    return _profile
+
+
+def get_candidate_profile():
+    """Return the compiled profile dict ({} if not built yet)."""
+    if _profile is None:
+        load_candidate_profile()
+    return _profile.get("profile", {})
+
+
+def get_candidate_profile_version():
+    """Source hash the current profile was compiled from (None if not built yet)."""
+    if _profile is None:
+        load_candidate_profile()
+    return _profile.get("source_hash")
+
+
+def ensure_candidate_profile(resume_path, build_profile, rebuild=False):
+    """
+    Rebuild the profile with build_profile() if the resume, model or PROFILE_STRUCTURE changed since it was
+    last compiled, or if rebuild (the user edited qna_list answers).
+    """
+    source_hash = _source_hash(resume_path)
+    if _profile is None:
+        load_candidate_profile()
+    if not rebuild and _profile.get("source_hash") == source_hash and _profile.get("profile"):
+        print("Candidate profile is up to date.")
+        return _profile["profile"]
+
+    print("Compiling candidate profile...")
+    try:
+        profile = build_profile()
+    except Exception as e:
+        print(f"Failed to compile candidate profile: {e}")
+        return get_candidate_profile()
+    if not isinstance(profile, dict) or not profile:
+        print("Candidate profile could not be parsed, keeping the previous one.")
+        return get_candidate_profile()
+
+    _profile.clear()
+    _profile.update({
+        "source_hash": source_hash,
+        "built_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "profile": _normalize(profile),
+    })
+    tmp_file = f"{CANDIDATE_PROFILE_FILE}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(_profile, f, indent=4)
+    os.replace(tmp_file, CANDIDATE_PROFILE_FILE)
+    return _profile["profile"]
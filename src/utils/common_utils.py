@@ -1,4 +1,5 @@
 import datetime
+import hashlib
 import json
 import os
 import re
@@ -86,6 +87,16 @@ def test_extract_valid_json():
     json_text3 = extract_valid_json(text3)
     print("Transformed json_text3:", json_text3)
 
+def file_sha256(file_path):
+    """Return the hex SHA-256 of a file's content, or "" if it does not exist."""
+    if not file_path or not os.path.exists(file_path):
+        return ""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 def last_modified_iso(file_path):
     return datetime.datetime.fromtimestamp(
         os.path.getmtime(file_path), datetime.timezone.utc
@@ -11,3 +11,36 @@ def append_row_to_csv(filepath, row):
     with open(filepath, mode='a', newline='', encoding='utf-8') as f:
         writer = csv.writer(f)
         writer.writerow(row)
+
+def _flatten(record, prefix=""):
+    flat = {}
+    for key, value in record.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+def export_csv(filepath, records, columns=None):
+    """
+    Stream dict records (any iterable, e.g. iter_jsonl) into a CSV file with constant memory.
+    Nested dicts become "parent.child" columns; columns default to those of the first record.
+    Returns the number of rows written.
+    """
+    records = iter(records)
+    first = next(records, None)
+    count = 0
+    with open(filepath, mode='w', newline='', encoding='utf-8') as f:
+        if first is None:
+            if columns:
+                csv.writer(f).writerow(columns)
+            return count
+        first = _flatten(first)
+        writer = csv.DictWriter(f, fieldnames=columns or list(first), extrasaction='ignore')
+        writer.writeheader()
+        writer.writerow(first)
+        count += 1
+        for record in records:
+            writer.writerow(_flatten(record))
+            count += 1
+    return count
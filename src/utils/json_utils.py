@@ -9,7 +9,10 @@ class JsonFile:
     def append(self, json_record):
         """
         Appends a record to the JSON file (creates as a list if not exists).
+        Only the new record is written, before the closing bracket; files that are not a JSON list are rewritten.
         """
+        if self._append_in_place(json_record):
+            return
         data = []
         if os.path.exists(self.file_path):
             with open(self.file_path, 'r', encoding='utf-8') as f:
@@ -23,6 +26,28 @@ class JsonFile:
         with open(self.file_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2)
 
+    def _append_in_place(self, json_record):
+        if not os.path.exists(self.file_path):
+            with open(self.file_path, 'w', encoding='utf-8') as f:
+                json.dump([json_record], f, indent=2)
+            return True
+        with open(self.file_path, 'rb+') as f:
+            head = f.read(64)
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            tail_start = max(0, size - 4096)
+            f.seek(tail_start)
+            tail = f.read().rstrip()
+            if not head.lstrip().startswith(b'[') or not tail.endswith(b']'):
+                return False
+            close_at = tail_start + len(tail) - 1
+            is_empty = tail[:-1].rstrip().endswith(b'[')
+            record = json.dumps(json_record, indent=2).replace('\n', '\n  ')
+            f.seek(close_at)
+            f.truncate()
+            f.write(f"{'' if is_empty else ','}\n  {record}\n]".encode('utf-8'))
+        return True
+
 # Backwards compatible function
 def save_json_record(file_path, json_record):
     JsonFile(file_path).append(json_record)
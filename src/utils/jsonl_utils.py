@@ -0,0 +1,103 @@
+"""Append-only JSON Lines files: buffered writer with size-based rotation (optionally gzipped) and streaming reader."""
+import datetime
+import glob
+import gzip
+import json
+import os
+import shutil
+
+
+class JsonlWriter:
+    """
+    Buffered JSONL appender. Records are written every flush_every records and on flush()/close().
+    When the file would grow past max_bytes it is rotated to "<name>.<timestamp><ext>[.gz]".
+    """
+
+    def __init__(self, file_path, flush_every=100, max_bytes=None, compress=False):
+        self.file_path = str(file_path)
+        self.flush_every = flush_every
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self._buffer = []
+        self._checked_tail = False
+        os.makedirs(os.path.dirname(self.file_path) or ".", exist_ok=True)
+
+    def write(self, record):
+        """Buffer a record; returns flush()'s offset when this write flushed the buffer, else None."""
+        self._buffer.append(json.dumps(record, ensure_ascii=False) + "\n")
+        if len(self._buffer) >= self.flush_every:
+            return self.flush()
+        return None
+
+    def write_all(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        """Write the buffered records; returns the byte offset in file_path where they start (0 after a rotation)."""
+        if not self._buffer:
+            return None
+        data = "".join(self._buffer).encode("utf-8")
+        self._buffer.clear()
+        size = os.path.getsize(self.file_path) if os.path.exists(self.file_path) else 0
+        if self.max_bytes and size and size + len(data) > self.max_bytes:
+            self.rotate()
+        with open(self.file_path, "ab") as f:
+            f.seek(0, os.SEEK_END)
+            if not self._checked_tail:
+                # start on a fresh line if the last write was torn
+                if f.tell() and not self._last_byte_is_newline():
+                    f.write(b"\n")
+                self._checked_tail = True
+            offset = f.tell()
+            f.write(data)
+        return offset
+
+    def _last_byte_is_newline(self):
+        with open(self.file_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def rotate(self):
+        """Move the current file aside (gzipped if compress) and start a new one."""
+        if not os.path.exists(self.file_path):
+            return
+        stem, ext = os.path.splitext(self.file_path)
+        rotated = f"{stem}.{datetime.datetime.now().strftime('%Y%m%d-%H%M%S-%f')}{ext}"
+        os.replace(self.file_path, rotated)
+        if self.compress:
+            with open(rotated, "rb") as src, gzip.open(f"{rotated}.gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(rotated)
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def rotated_files(file_path):
+    """Rotated parts of file_path, oldest first."""
+    stem, ext = os.path.splitext(str(file_path))
+    return sorted(glob.glob(f"{glob.escape(stem)}.*{ext}") + glob.glob(f"{glob.escape(stem)}.*{ext}.gz"))
+
+
+def iter_jsonl(file_path, include_rotated=True):
+    """Yield records one at a time, oldest first (rotated parts, then the current file). Bad lines are skipped."""
+    paths = (rotated_files(file_path) if include_rotated else []) + [str(file_path)]
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue  # torn or hand-edited line
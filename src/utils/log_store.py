@@ -0,0 +1,136 @@
+"""Append-only key/value log backed by a JSON snapshot."""
+import json
+import os
+import threading
+import time
+
+
+class LogStore:
+    """
+    Persists a dict as a JSON snapshot plus an append-only JSONL log of changes.
+
+    Every set/delete appends one line to the log (O(1) disk), fsync is batched, and the
+    log is folded back into the snapshot once it outgrows the live data. On load the
+    snapshot is read and the log replayed; a torn last line from a crash is dropped.
+    """
+
+    def __init__(self, snapshot_path, log_path, fsync_every=50, fsync_interval=2.0, compact_min_ops=1000,
+                 indent=None):
+        self.snapshot_path = str(snapshot_path)
+        self.log_path = str(log_path)
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.compact_min_ops = compact_min_ops
+        self.indent = indent
+        self.log_ops = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._log = None
+        self._lock = threading.RLock()
+        os.makedirs(os.path.dirname(self.snapshot_path) or ".", exist_ok=True)
+
+    def load(self):
+        """Return the stored dict: snapshot + replayed log."""
+        with self._lock:
+            data = {}
+            if os.path.exists(self.snapshot_path):
+                try:
+                    with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    if not isinstance(data, dict):
+                        data = {}
+                except Exception as e:
+                    print(f"Failed to load snapshot '{self.snapshot_path}': {e}")
+                    data = {}
+            self.log_ops = self._replay(data)
+            return data
+
+    def _replay(self, data):
+        if not os.path.exists(self.log_path):
+            return 0
+        ops = 0
+        good_offset = 0
+        with open(self.log_path, "rb") as f:
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(raw)
+                except ValueError:
+                    break
+                self._apply(data, record)
+                good_offset += len(raw)
+                ops += 1
+        if good_offset != os.path.getsize(self.log_path):
+            print(f"Dropping torn tail of '{self.log_path}' at byte {good_offset}")
+            with open(self.log_path, "r+b") as f:
+                f.truncate(good_offset)
+        return ops
+
+    @staticmethod
+    def _apply(data, record):
+        op = record.get("op")
+        if op == "set":
+            data[record["k"]] = record["v"]
+        elif op == "del":
+            data.pop(record["k"], None)
+        elif op == "clear":
+            data.clear()
+
+    def set(self, key, value):
+        self._append({"op": "set", "k": key, "v": value})
+
+    def delete(self, key):
+        self._append({"op": "del", "k": key})
+
+    def _append(self, record):
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._log is None:
+                self._log = open(self.log_path, "a", encoding="utf-8")
+            self._log.write(line)
+            self._log.flush()
+            self.log_ops += 1
+            self._unsynced += 1
+            if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+                self._sync()
+
+    def _sync(self):
+        if self._log is not None and self._unsynced:
+            os.fsync(self._log.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def flush(self):
+        """Force pending log writes to disk."""
+        with self._lock:
+            if self._log is not None:
+                self._log.flush()
+            self._sync()
+
+    def needs_compaction(self, live_count):
+        """True once the log holds more records than the live data it describes."""
+        return self.log_ops >= self.compact_min_ops and self.log_ops > live_count
+
+    def compact(self, data):
+        """Atomically rewrite the snapshot from data and truncate the log."""
+        with self._lock:
+            tmp_path = f"{self.snapshot_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=self.indent)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            if self._log is not None:
+                self._log.close()
+            self._log = open(self.log_path, "w", encoding="utf-8")
+            self.log_ops = 0
+            self._unsynced = 0
+            self._last_sync = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            if self._log is not None:
+                self.flush()
+                self._log.close()
+                self._log = None
@@ -0,0 +1,154 @@
+"""Local matching of free-text answers to select/radio options."""
+import difflib
+import re
+
+_YES = {"yes", "y", "true", "yeah", "yep", "i do", "i am", "i have", "i will", "correct"}
+_NO = {"no", "n", "false", "nope", "i do not", "i don t", "i am not", "i have not", "i will not"}
+
+_YES_LEADS = {"yes", "yeah", "yep", "true", "correct"}
+_NO_LEADS = {"no", "nope", "false"}
+
+# "not authorized" and "authorized" look alike to fuzzy matching; a pair differing in negation never matches
+_NEGATION_WORDS = {"not", "no", "never", "non", "none", "cannot", "without", "nor"}
+_NEGATION_PREFIXES = ("un", "in", "im", "ir", "il", "non", "dis")
+
+_NUMBER = r"(\d+(?:\.\d+)?)"
+
+
+def normalize_option(text):
+    """Lowercase, drop punctuation (except + and #) and collapse whitespace."""
+    text = re.sub(r"[^\w+#\s]", " ", str(text).lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _tokens(text):
+    return set(normalize_option(text).split())
+
+
+def _yes_no(text):
+    """"yes"/"no" for answers like "Yes", "I do not" or "Yes, I am authorized", else None."""
+    norm = normalize_option(text)
+    first = norm.split(" ", 1)[0]
+    if norm in _YES or first in _YES_LEADS:
+        return "yes"
+    if norm in _NO or first in _NO_LEADS:
+        return "no"
+    return None
+
+
+def _is_negated(norm, other_tokens):
+    """
+    Whether a normalized text negates: a negation word ("not", "never", "don t" from "don't"), or a word that is a
+    prefixed negation of a word of the other text ("unavailable" against "available").
+    """
+    tokens = norm.split()
+    if _NEGATION_WORDS.intersection(tokens) or re.search(r"\wn t\b", norm):
+        return True
+    return any(word.startswith(prefix) and len(word) - len(prefix) >= 4 and word[len(prefix):] in other_tokens
+               for word in tokens for prefix in _NEGATION_PREFIXES)
+
+
+def _same_polarity(answer, label):
+    answer_norm, label_norm = normalize_option(answer), normalize_option(label)
+    return (_is_negated(answer_norm, set(label_norm.split()))
+            == _is_negated(label_norm, set(answer_norm.split())))
+
+
+def _numeric_range(label):
+    """Return (low, high) covered by an option label like "3-5 years", "5+", "More than 10", or None."""
+    norm = label.lower().replace(",", "")
+    match = re.search(rf"{_NUMBER}\s*(?:-|–|to)\s*{_NUMBER}", norm)
+    if match:
+        return float(match.group(1)), float(match.group(2))
+    match = re.search(rf"{_NUMBER}\s*\+|(?:more than|over|above|at least|greater than)\s*{_NUMBER}|{_NUMBER}\s*(?:or more|and above|and more)", norm)
+    if match:
+        low = float(next(g for g in match.groups() if g))
+        return (low + 1e-9 if "than" in norm or "over" in norm or "above" in norm else low), float("inf")
+    match = re.search(rf"(?:less than|under|below|fewer than)\s*{_NUMBER}", norm)
+    if match:
+        return float("-inf"), float(match.group(1)) - 1e-9
+    match = re.fullmatch(rf"\s*{_NUMBER}\s*(?:years?|yrs?|months?|days?)?\s*", norm)
+    if match:
+        return float(match.group(1)), float(match.group(1))
+    return None
+
+
+def _match_number(answer, labels):
+    match = re.fullmatch(rf"\s*{_NUMBER}\s*(?:\+|years?|yrs?|months?|days?)?\s*", answer.lower())
+    if not match:
+        return None
+    value = float(match.group(1))
+    for label in labels:
+        bounds = _numeric_range(label)
+        if bounds and bounds[0] <= value <= bounds[1]:
+            return label
+    return None
+
+
+def _match_country(answer, labels):
+    """Match a dial code ("+65", "65") or country name ("Singapore") to labels like "Singapore (+65)"."""
+    code = re.fullmatch(r"\s*\(?\+?\s*(\d{1,4})\)?\s*", answer)
+    if code:
+        pattern = re.compile(rf"\(\+{code.group(1)}\)")
+        hits = [label for label in labels if pattern.search(label)]
+        return hits[0] if len(hits) == 1 else None
+    norm = normalize_option(answer)
+    if not norm:
+        return None
+    for label in labels:
+        name = normalize_option(re.sub(r"\(\+\d+\)", "", label))
+        if "(+" in label and (name == norm or norm.startswith(name + " ") or name.startswith(norm + " ")):
+            return label
+    return None
+
+
+def _match_fuzzy(answer, labels, min_ratio=0.8):
+    norm = normalize_option(answer)
+    answer_tokens = set(norm.split())
+    best, best_score = None, 0.0
+    for label in labels:
+        if not _same_polarity(answer, label):
+            continue
+        label_norm = normalize_option(label)
+        label_tokens = set(label_norm.split())
+        overlap = len(answer_tokens & label_tokens) / len(answer_tokens | label_tokens) if label_tokens else 0.0
+        score = max(overlap, difflib.SequenceMatcher(None, norm, label_norm).ratio())
+        if score > best_score:
+            best, best_score = label, score
+    return best if best_score >= min_ratio else None
+
+
+def match_option(answer, labels):
+    """
+    Map a free-text answer to one of labels: exact, normalized, yes/no, numeric range,
+    country/dial code, then fuzzy token match. Returns the label or None.
+    """
+    if answer is None or not labels:
+        return None
+    answer = str(answer).strip().strip("'\"").strip()
+    if not answer:
+        return None
+    if answer in labels:
+        return answer
+    norm = normalize_option(answer)
+    for label in labels:
+        if normalize_option(label) == norm:
+            return label
+    yes_no = _yes_no(answer)
+    if yes_no:
+        for label in labels:
+            if _yes_no(label) == yes_no:
+                return label
+    return (_match_number(answer, labels)
+            or _match_country(answer, labels)
+            or _match_fuzzy(answer, labels))
+
+
+def shortlist_options(labels, hints, k=10):
+    """Return the k labels sharing the most tokens with hints (original order on ties), in original order."""
+    if len(labels) <= k:
+        return list(labels)
+    hint_tokens = _tokens(hints)
+    scored = sorted(enumerate(labels), key=lambda x: (-len(_tokens(x[1]) & hint_tokens), x[0]))
+    keep = sorted(i for i, _ in scored[:k])
+    return [labels[i] for i in keep]
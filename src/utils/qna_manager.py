@@ -1,49 +1,279 @@
+import datetime
+import hashlib
+import json
+from concurrent.futures import Future, ThreadPoolExecutor
+
 from ai.openai_provider import ask_text_from_ai, ask_select_from_ai, ask_recruiter_message_from_ai, \
-    ask_recruiter_connect_note_from_ai
-from utils.user_data_manager import append_qna_list
-from .cache_manager import get_from_cache, set_to_cache
+    ask_recruiter_connect_note_from_ai, ask_answers_batch_from_ai, sync_user_details
+from config import BATCH_FORM_ANSWERS, AI_PREFETCH_WORKERS, SELECT_SHORTLIST_SIZE, JOB_LOCATION, WARMUP_QUESTIONS, \
+    QNA_LIST_FILE, OPENAI_MODEL
+from utils.common_utils import file_sha256
+from utils.run_data_manager import get_run_data, update_run_data
+from utils.user_data_manager import append_qna_list, get_qna_list, get_resume_file
+from utils.write_behind import flush_writes
+from .answer_model import predict_answer
+from .answer_rules import answer_from_profile
+from .cache_manager import get_from_cache, set_to_cache, get_full_cache, remove_from_cache, is_cached, \
+    get_full_qna_cache
+from .option_matcher import match_option, shortlist_options
+from .question_normalizer import canonical_question
+from .template_cache import get_from_template
 
 _non_caching_ques = ["headline", "summary", "cover letter", "message to"]
 
+# Prefetched answers not yet consumed: cache_key -> (future, batch item id or None, question)
+_inflight = {}
+_prefetch_pool = None
+_warmup_fingerprint = None
+
+def _get_cached(cache_key, legacy_key):
+    """Look up the canonical key, migrating an entry stored under the raw-question key if present."""
+    answer = get_from_cache(cache_key)
+    if answer is None and legacy_key != cache_key:
+        answer = get_full_cache().get(legacy_key)
+        if answer is not None:
+            set_to_cache(cache_key, answer)
+            remove_from_cache(legacy_key)
+    return answer
+
+def _text_cache_keys(question, validation=None):
+    """Return (cache_key, legacy_key) for a text question."""
+    validation = f"(Validation: {validation.strip()})" if validation else ""
+    return f"text::{canonical_question(question)}{validation}", f"text::{question.strip()}{validation}"
+
+def _options_key(options):
+    """Long option lists (country codes, ...) are keyed by digest to keep cache keys short."""
+    if len(options) <= SELECT_SHORTLIST_SIZE:
+        return str(options)
+    return "#" + hashlib.sha1(json.dumps(options).encode("utf-8")).hexdigest()[:16]
+
+def _select_cache_keys(question, options):
+    """Return (cache_key, legacy_key) for a select question."""
+    options_key = _options_key(options)
+    return f"select::{canonical_question(question)}::{options_key}", f"select::{question.strip()}::{options_key}"
+
+def _local_select_answer(question, options):
+    """Pick an option without AI from an answer already known for this question (other option list or qna_list)."""
+    for known in (get_full_qna_cache().get(canonical_question(question)), get_qna_list().get(question.strip())):
+        if isinstance(known, str) and known:
+            match = match_option(known, options)
+            if match:
+                return match
+    return None
+
+def _ai_options(question, options):
+    """Options to show the AI: all of them, or the top SELECT_SHORTLIST_SIZE by overlap with the candidate's details."""
+    hints = " ".join([question, JOB_LOCATION, *get_qna_list().values()])
+    return shortlist_options(options, hints, SELECT_SHORTLIST_SIZE)
+
+def _is_long_form(question):
+    question_lower = question.strip().lower()
+    return any(s in question_lower for s in _non_caching_ques)
+
+def _long_form_answer(question, validation=None):
+    """Cover letters, headlines etc. are job specific: never cached as-is, only reused as templates."""
+    cache_key, legacy_key = _text_cache_keys(question, validation)
+    for key in (cache_key, legacy_key):
+        remove_from_cache(key)  # cached for another job before long-form answers were templated
+    validation = f"(Validation: {validation.strip()})" if validation else ""
+    answer = get_from_template(cache_key.removeprefix("text::"), lambda: ask_text_from_ai(question, validation))
+    if answer == "''":
+        answer = ""
+    print(f"Answer: {answer}")
+    return answer
+
 def get_text_answer(question, validation=None):
     """Return cached answer if present (including empty string). Otherwise ask AI and cache result."""
+    if _is_long_form(question):
+        return _long_form_answer(question, validation)
+    cache_key, legacy_key = _text_cache_keys(question, validation)
     validation = f"(Validation: {validation.strip()})" if validation else ""
-    cache_key = f"text::{question.strip()}{validation}"
-    answer = get_from_cache(cache_key)
+    answer = _get_cached(cache_key, legacy_key)
     if answer is not None:
         print("Cache hit for get_text_answer: ", answer)
         return answer
-    answer = ask_text_from_ai(question, validation)
+    answer = answer_from_profile(question)
+    if answer is not None:
+        # derived from the profile each time, not cached, so it follows profile changes
+        print(f"Answer from profile: {answer}")
+        return answer
+    answer = predict_answer(question, validation=validation)
+    if answer is not None:
+        # a model guess is neither cached nor added to qna_list, so it never becomes training data
+        print(f"Answer: {answer}")
+        return answer
+    answer = _take_prefetched(cache_key)
+    if answer is None:
+        answer = ask_text_from_ai(question, validation)
     if answer == "''":
         answer = ""
-    question_lower = question.strip().lower()
-    if any(s not in question_lower for s in _non_caching_ques):
-        set_to_cache(cache_key, answer)
-        append_qna_list(question, answer)
+    set_to_cache(cache_key, answer)
+    append_qna_list(question, answer)
     print(f"Answer: {answer}")
     return answer
 
 def get_recruiter_message(recruiter_name):
-    return ask_recruiter_message_from_ai(recruiter_name)
+    return get_from_template("recruiter message", lambda: ask_recruiter_message_from_ai(recruiter_name),
+                             recruiter_name)
 
 
 def get_recruiter_connect_note(recruiter_name):
-    return ask_recruiter_connect_note_from_ai(recruiter_name)
+    return get_from_template("recruiter connect note", lambda: ask_recruiter_connect_note_from_ai(recruiter_name),
+                             recruiter_name)
 
 
 def get_select_answer(question, options):
     """Return cached select answer if present (including empty string). Otherwise ask AI and cache result."""
-    cache_key = f"select::{question.strip()}::{str(options)}"
-    answer = get_from_cache(cache_key)
+    cache_key, legacy_key = _select_cache_keys(question, options)
+    answer = _get_cached(cache_key, legacy_key)
     if answer is not None:
         print("Cache hit for get_select_answer: ", answer)
+        return match_option(answer, options) or ""
+    answer = (_local_select_answer(question, options) or answer_from_profile(question, options)
+              or predict_answer(question, options))
+    if answer is not None:
+        # derived locally each time, not cached nor added to qna_list, so it follows qna_list and profile
+        # changes and model guesses never become training data (see get_text_answer)
+        print(f"Selected option: {answer}")
         return answer
-    # not in cache -> ask AI
-    answer = ask_select_from_ai(question, options)
-    if answer == "''":
-        answer = ""
-    if question.strip() not in _non_caching_ques:
+    # not known locally -> take the prefetched answer or ask AI, then map it onto the real options
+    ai_answer = _take_prefetched(cache_key)
+    if ai_answer is None:
+        ai_answer = ask_select_from_ai(question, _ai_options(question, options))
+    answer = match_option(ai_answer, options) or ""
+    if ai_answer and ai_answer != "''" and not answer:
+        print(f"AI answer '{ai_answer}' matches none of the options")
+    if not _is_long_form(question):
         set_to_cache(cache_key, answer)
         append_qna_list(question, answer)
     print(f"Selected option: {answer}")
     return answer
+
+
+def _get_prefetch_pool():
+    global _prefetch_pool
+    if _prefetch_pool is None and AI_PREFETCH_WORKERS > 0:
+        _prefetch_pool = ThreadPoolExecutor(max_workers=AI_PREFETCH_WORKERS, thread_name_prefix="ai-prefetch")
+    return _prefetch_pool
+
+def _submit(fn, *args):
+    """Run fn on the prefetch pool, or inline when prefetching in the background is disabled."""
+    pool = _get_prefetch_pool()
+    if pool:
+        return pool.submit(fn, *args)
+    future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+def _take_prefetched(cache_key):
+    """Wait for and return the prefetched answer for cache_key, or None if there is none (or it failed)."""
+    entry = _inflight.pop(cache_key, None)
+    if not entry:
+        return None
+    future, item_id, q = entry
+    try:
+        result = future.result()
+    except Exception as e:
+        print(f"Prefetching answer for '{q['question']}' failed: {e}")
+        return None
+    answer = result if item_id is None else result.get(item_id)
+    return answer if isinstance(answer, str) else None
+
+def prefetch_form_answers(questions, batch=BATCH_FORM_ANSWERS):
+    """
+    Start AI lookups for every uncached question of a form step without waiting for them.
+    With batch the misses go out as one request, otherwise one request each on the
+    prefetch pool. get_text_answer/get_select_answer pick the answers up as the fields are filled.
+    :param questions: list of {"type": "text"|"select", "question", "validation"?, "options"?}
+    """
+    pending = {}
+    for q in questions:
+        if not q.get("question") or _is_long_form(q["question"]):
+            continue
+        if q["type"] == "select":
+            cache_key, legacy_key = _select_cache_keys(q["question"], q["options"])
+        else:
+            cache_key, legacy_key = _text_cache_keys(q["question"], q.get("validation"))
+        if cache_key in pending or cache_key in _inflight or is_cached(cache_key) or is_cached(legacy_key):
+            continue
+        if q["type"] == "select" and _local_select_answer(q["question"], q["options"]) is not None:
+            continue
+        if answer_from_profile(q["question"], q.get("options")) is not None:
+            continue
+        if predict_answer(q["question"], q.get("options"), q.get("validation")) is not None:
+            continue
+        pending[cache_key] = q
+    if not pending:
+        return
+
+    if batch and len(pending) > 1:
+        print(f"Prefetching {len(pending)} answers in one batch...")
+        requests = [dict(q, id=str(i), options=_ai_options(q["question"], q["options"])) if q["type"] == "select"
+                    else dict(q, id=str(i))
+                    for i, q in enumerate(pending.values())]
+        future = _submit(ask_answers_batch_from_ai, requests)
+        for (cache_key, q), item in zip(pending.items(), requests):
+            _inflight[cache_key] = (future, item["id"], q)
+    elif AI_PREFETCH_WORKERS > 0:
+        print(f"Prefetching {len(pending)} answers...")
+        for cache_key, q in pending.items():
+            if q["type"] == "select":
+                future = _submit(ask_select_from_ai, q["question"], _ai_options(q["question"], q["options"]))
+            else:
+                validation = f"(Validation: {q['validation'].strip()})" if q.get("validation") else ""
+                future = _submit(ask_text_from_ai, q["question"], validation)
+            _inflight[cache_key] = (future, None, q)
+
+def collect_prefetched_answers():
+    """Wait for prefetched answers that no field consumed and cache them together."""
+    for cache_key in list(_inflight):
+        q = _inflight[cache_key][2]
+        answer = _take_prefetched(cache_key)
+        if answer is None:
+            continue
+        if q["type"] == "select":
+            answer = match_option(answer, q["options"]) or ""
+        elif answer == "''":
+            answer = ""
+        set_to_cache(cache_key, answer)
+        append_qna_list(q["question"], answer)
+
+def _warmup_fingerprint_now():
+    parts = [file_sha256(get_resume_file()), file_sha256(QNA_LIST_FILE), OPENAI_MODEL, json.dumps(WARMUP_QUESTIONS)]
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+def start_cache_warmup():
+    """
+    Sync the user details with AI on this thread, then, if the resume, qna_list, model or WARMUP_QUESTIONS changed
+    since the last warm-up, start one batched AI request for the catalogue questions not answered yet.
+    finish_cache_warmup() caches the answers.
+    """
+    global _warmup_fingerprint
+    # before any prefetch worker: the sync clears the answer cache and rebuilds the profile, which are not locked
+    sync_user_details()
+    if not WARMUP_QUESTIONS:
+        return
+    fingerprint = _warmup_fingerprint_now()
+    if get_run_data().get("cache_warmup", {}).get("fingerprint") == fingerprint:
+        print("Cache warm-up is up to date.")
+        return
+    print("Warming up the answer cache...")
+    _warmup_fingerprint = fingerprint
+    prefetch_form_answers(WARMUP_QUESTIONS, batch=True)
+
+def finish_cache_warmup():
+    """Wait for the warm-up request started by start_cache_warmup() and cache its answers."""
+    global _warmup_fingerprint
+    if not _warmup_fingerprint:
+        return
+    collect_prefetched_answers()
+    flush_writes()
+    # taken after the answers were added to qna_list, so they don't trigger the next warm-up
+    update_run_data("cache_warmup", {
+        "fingerprint": _warmup_fingerprint_now(),
+        "warmed_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+    })
+    _warmup_fingerprint = None
@@ -0,0 +1,96 @@
+"""Canonical form of form questions, so near-identical wordings share one cache entry."""
+import re
+import sys
+from collections import defaultdict
+
+# Skill-slot templates: the first match wins and produces "years experience <skill>"
+_SKILL_TEMPLATES = [
+    re.compile(r"^how many (?:total )?years (?:of )?(?:experience )?do you have (?:with|in|using|on|of|working with) (?P<skill>.+)$"),
+    re.compile(r"^how many (?:total )?years of (?P<skill>experience) do you have$"),
+    re.compile(r"^how many (?:total )?years of (?:experience )?(?:with |in |using )?(?P<skill>.+?) (?:experience )?do you (?:currently )?have$"),
+    re.compile(r"^how many years have you (?:worked|been working) (?:with|in|on) (?P<skill>.+)$"),
+    re.compile(r"^years of (?:experience )?(?:with|in|using) (?P<skill>.+)$"),
+]
+
+# Known LinkedIn phrasing variants, applied in order to the lowercased, punctuation-free text
+_PHRASE_VARIANTS = [
+    (r"\b(?:work|professional|relevant|industry|hands on|practical|commercial) experience\b", "experience"),
+    (r"\bauthoris", "authoriz"),
+    (r"\blegally\b", ""),
+    (r"\bwill you now or in the future require\b", "do you require"),
+    (r"\bdo you now or will you in the future require\b", "do you require"),
+    (r"\b(?:mobile phone|cell phone|mobile|phone) number\b", "phone number"),
+    (r"^(?:please )?(?:enter|provide|specify)\b", ""),
+    (r"^(?:please )?(?:what is|what s|whats) your\b", ""),
+    (r"^your\b", ""),
+    (r"\bin years$", ""),
+]
+_PHRASE_VARIANTS = [(re.compile(p), r) for p, r in _PHRASE_VARIANTS]
+
+_SKILL_FILLERS = re.compile(r"^(?:the |a |an )|(?: technology| technologies| framework| language| development| programming)$")
+
+
+def _basic_normalize(text):
+    text = text.lower().strip()
+    # keep "node.js" -> "nodejs", "e-mail" -> "email", but keep "c++" / "c#" distinct from "c"
+    text = re.sub(r"(?<=\w)[.\-'’](?=\w)", "", text)
+    text = re.sub(r"[^\w+#\s]", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def normalize_skill(skill):
+    """Normalize a skill name the way skill slots of canonical questions are ("React.js" -> "reactjs")."""
+    skill = _basic_normalize(skill)
+    previous = None
+    while previous != skill:
+        previous = skill
+        skill = _SKILL_FILLERS.sub("", skill).strip()
+    return skill
+
+
+def canonical_question(question):
+    """Return the canonical cache key text for a form question (lowercase, no punctuation, variants collapsed)."""
+    if not question:
+        return ""
+    text = _basic_normalize(question)
+    for pattern, replacement in _PHRASE_VARIANTS:
+        text = re.sub(r"\s+", " ", pattern.sub(replacement, text)).strip()
+    for template in _SKILL_TEMPLATES:
+        match = template.match(text)
+        if match:
+            skill = normalize_skill(match.group("skill"))
+            return f"years experience {skill if skill != 'experience' else 'total'}"
+    return text or _basic_normalize(question)
+
+
+def collapse_report(questions):
+    """Group raw questions by canonical key. Returns [(canonical, [raw, ...])], biggest groups first."""
+    groups = defaultdict(list)
+    for question in dict.fromkeys(q.strip() for q in questions if q and q.strip()):
+        groups[canonical_question(question)].append(question)
+    return sorted(groups.items(), key=lambda x: (-len(x[1]), x[0]))
+
+
+def print_collapse_report(questions, limit=50):
+    report = collapse_report(questions)
+    raw_count = sum(len(raws) for _, raws in report)
+    print(f"{raw_count} distinct raw questions -> {len(report)} canonical keys")
+    for canonical, raws in report[:limit]:
+        if len(raws) < 2:
+            break
+        print(f"\n[{len(raws)}] {canonical}")
+        for raw in raws:
+            print(f"    {raw}")
+
+
+if __name__ == "__main__":
+    # Report on every raw question answered so far (qna_list.txt) plus legacy raw cache keys
+    from utils.cache_manager import get_full_cache
+    from utils.user_data_manager import read_qna_list_qnas
+
+    _, qnas = read_qna_list_qnas()
+    raw_questions = list(qnas)
+    for key in get_full_cache():
+        ques = key.split("::")[1] if "::" in key else key
+        raw_questions.append(re.sub(r"\(Validation: .*\)$", "", ques))
+    print_collapse_report(raw_questions, int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -0,0 +1,70 @@
+"""
+Relevancy evaluations per LinkedIn job id, with the job conversation they started. Reused when the same
+posting shows up again (another keyword, a re-run, apply_with_urls.txt) while its description, the resume
+and the model are unchanged.
+"""
+import hashlib
+import time
+
+from config import OPENAI_MODEL, RELEVANCY_CACHE_DAYS, RELEVANCY_CACHE_FILE, RELEVANCY_CACHE_LOG_FILE
+from utils.cache_manager import new_store
+from utils.common_utils import file_sha256
+from utils.user_data_manager import get_resume_file
+
+_cache = None  # job id -> {"h": job hash, "v": profile version, "status": {...}, "chat_id": str, "t": epoch}
+_store = None
+_version = None
+
+
+def _load():
+    global _cache, _store
+    _store = new_store("relevancy", RELEVANCY_CACHE_FILE, RELEVANCY_CACHE_LOG_FILE)
+    try:
+        _cache = _store.load()
+    except Exception as e:
+        print(f"Failed to load relevancy cache: {e}")
+        _cache = {}
+    if _store.needs_compaction(len(_cache)):
+        _store.compact(_cache)
+
+
+def _profile_version():
+    """Identity of what the candidate side of an evaluation depends on: resume content and model."""
+    global _version
+    if _version is None:
+        parts = [file_sha256(get_resume_file()), OPENAI_MODEL]
+        _version = hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:16]
+    return _version
+
+
+def _job_hash(job_details):
+    text = "|".join(str(job_details.get(key) or "") for key in ("title", "company", "description"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def get_cached_relevancy(job_id, job_details):
+    """Return (relevancy status, job chat id) evaluated before for this job, or None."""
+    if not job_id or not RELEVANCY_CACHE_DAYS:
+        return None
+    if _cache is None:
+        _load()
+    entry = _cache.get(str(job_id))
+    if not entry or entry.get("h") != _job_hash(job_details) or entry.get("v") != _profile_version():
+        return None
+    if time.time() - entry.get("t", 0) > RELEVANCY_CACHE_DAYS * 86400:
+        return None
+    return entry["status"], entry.get("chat_id")
+
+
+def cache_relevancy(job_id, job_details, relevancy_status, chat_id):
+    if not job_id or not RELEVANCY_CACHE_DAYS or not isinstance(relevancy_status, dict):
+        return
+    if _cache is None:
+        _load()
+    entry = {"h": _job_hash(job_details), "v": _profile_version(), "status": relevancy_status,
+             "chat_id": chat_id, "t": int(time.time())}
+    _cache[str(job_id)] = entry
+    _store.set(str(job_id), entry)
+    _store.flush()
+    if _store.needs_compaction(len(_cache)):
+        _store.compact(_cache)
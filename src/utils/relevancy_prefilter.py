@@ -0,0 +1,190 @@
+"""
+Local keyword relevancy score (BM25 of JOB_KEYWORDS and the profile skills against the job title and
+description), computed before the AI relevancy check so clearly off-target jobs never reach the model.
+Check the thresholds against past AI scores with `PYTHONPATH=src python src/utils/relevancy_prefilter.py calibrate`.
+"""
+import math
+import sys
+from collections import Counter
+
+from config import JOB_KEYWORDS, RELEVANCY_PERCENTAGE, RELEVANCY_PREFILTER_FILE, RELEVANCY_PREFILTER_LOG_FILE, \
+    RELEVANCY_PREFILTER_PASS, RELEVANCY_PREFILTER_REJECT
+from utils.cache_manager import new_store
+from utils.candidate_profile import get_candidate_profile
+from utils.question_normalizer import normalize_skill
+from utils.seen_jobs import was_job_seen
+
+_K1 = 1.2
+_B = 0.75
+_TITLE_BOOST = 3  # a term in the job title counts as this many description mentions
+_KEYWORD_WEIGHT = 2.0  # JOB_KEYWORDS terms; skills weigh 1-2 by years of experience
+# Fixed IDF of JOB_KEYWORDS terms, as if in 1 of 10 jobs: the corpus comes from searching those keywords, so nearly
+# every job has them and their corpus IDF would fall to ~0
+_KEYWORD_IDF = math.log(10)
+_SCORE_SCALE = 5.0  # raw BM25 sum giving a score of 63/100
+_MAX_PHRASE_WORDS = 3
+
+# Corpus statistics for IDF: "_docs", "_length" and the document frequency of every query term seen
+_stats = None
+_store = None
+
+
+def _load():
+    global _stats, _store
+    _store = new_store("relevancy_prefilter", RELEVANCY_PREFILTER_FILE, RELEVANCY_PREFILTER_LOG_FILE)
+    try:
+        _stats = _store.load()
+    except Exception as e:
+        print(f"Failed to load relevancy prefilter stats: {e}")
+        _stats = {}
+    if _store.needs_compaction(len(_stats)):
+        _store.compact(_stats)
+
+
+def _terms(text):
+    """Counter of the 1-3 word phrases of a normalized text, so multi-word skills match as phrases."""
+    words = normalize_skill(text or "").split()
+    return Counter(" ".join(words[i:i + n]) for n in range(1, _MAX_PHRASE_WORDS + 1)
+                   for i in range(len(words) - n + 1)), len(words)
+
+
+def _keyword_terms():
+    return set(normalize_skill(JOB_KEYWORDS or "").split())
+
+
+def query_terms():
+    """{term: weight} from JOB_KEYWORDS and the candidate profile skills."""
+    terms = {}
+    for skill, years in (get_candidate_profile().get("skills") or {}).items():
+        term = normalize_skill(skill)
+        if term:
+            years = years if isinstance(years, (int, float)) else 0
+            terms[term] = 1 + min(max(years, 0), 10) / 10
+    for term in _keyword_terms():
+        terms[term] = _KEYWORD_WEIGHT
+    return terms
+
+
+def _tf(counts, term):
+    # "reactjs" also matches "react"
+    tf = counts.get(term, 0)
+    if term.endswith("js") and len(term) > 4:
+        tf += counts.get(term[:-2].strip(), 0)
+    return tf
+
+
+def score_job(job_details, update_stats=True):
+    """
+    Return (score 0-100, matched terms) for a job, or (None, []) without query terms.
+    update_stats adds the job to the corpus statistics used for IDF.
+    """
+    terms, keywords = query_terms(), _keyword_terms()
+    if not terms:
+        return None, []
+    if _stats is None:
+        _load()
+    title_counts, _ = _terms(job_details.get("title"))
+    description_counts, length = _terms(job_details.get("description"))
+    docs, total_length = _stats.get("_docs", 0), _stats.get("_length", 0)
+    average_length = total_length / docs if docs else max(length, 1)
+
+    raw, matched = 0.0, []
+    for term, weight in terms.items():
+        tf = _tf(description_counts, term) + _TITLE_BOOST * _tf(title_counts, term)
+        if not tf:
+            continue
+        df = _stats.get(term, 0)
+        idf = _KEYWORD_IDF if term in keywords else math.log(1 + (docs - df + 0.5) / (df + 0.5))
+        saturation = tf * (_K1 + 1) / (tf + _K1 * (1 - _B + _B * length / average_length))
+        raw += weight * idf * saturation
+        matched.append(term)
+
+    if update_stats:
+        updates = {"_docs": docs + 1, "_length": total_length + length}
+        updates.update((term, _stats.get(term, 0) + 1) for term in matched)
+        _stats.update(updates)
+        for key, value in updates.items():
+            _store.set(key, value)
+        _store.flush()
+    return round(100 * (1 - math.exp(-raw / _SCORE_SCALE))), matched
+
+
+def prefilter_relevancy(job_details, allow_reject=True, job_id=None):
+    """
+    Return (score, relevancy status) where the status is a local decision shaped like the AI relevancy
+    status, or None if the AI has to evaluate the job (score between the thresholds).
+    A job counts towards the corpus statistics once, the first time its job id is processed.
+    """
+    score, matched = score_job(job_details, update_stats=bool(job_id) and not was_job_seen(job_id))
+    if score is None:
+        return None, None
+    status = {"relevancyPercentage": score, "match": ", ".join(matched), "mismatch": "", "source": "prefilter"}
+    if allow_reject and RELEVANCY_PREFILTER_REJECT is not None and score < RELEVANCY_PREFILTER_REJECT:
+        return score, dict(status, isRelevant=False)
+    if RELEVANCY_PREFILTER_PASS is not None and score >= RELEVANCY_PREFILTER_PASS:
+        return score, dict(status, isRelevant=True)
+    return score, None
+
+
+def _ranks(values):
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2
+        i = j + 1
+    return ranks
+
+
+def _correlation(xs, ys):
+    n = len(xs)
+    mean_x, mean_y = sum(xs) / n, sum(ys) / n
+    cov = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    var_y = sum((y - mean_y) ** 2 for y in ys)
+    return cov / math.sqrt(var_x * var_y) if var_x and var_y else 0.0
+
+
+def calibrate(records, reject_thresholds=range(5, 55, 5), pass_thresholds=range(50, 100, 5)):
+    """Print how local scores of past jobs compare with their AI relevancy scores, per threshold."""
+    pairs = [(r["prefilter_score"], r["relevancy"]) for r in records
+             if r.get("prefilter_score") is not None and r.get("relevancy") is not None
+             and r.get("relevancy_source") != "prefilter"]
+    if len(pairs) < 2:
+        print(f"Not enough jobs with both a local and an AI relevancy score ({len(pairs)})")
+        return
+    local, ai = [p[0] for p in pairs], [p[1] for p in pairs]
+    relevant = [score >= RELEVANCY_PERCENTAGE for score in ai]
+    print(f"{len(pairs)} jobs, {sum(relevant)} relevant by AI (>= {RELEVANCY_PERCENTAGE}%), "
+          f"Spearman correlation {_correlation(_ranks(local), _ranks(ai)):.2f}")
+
+    print("Local score  jobs  mean AI score  AI relevant")
+    for bucket in range(0, 100, 10):
+        ai_scores = [a for l, a in pairs if bucket <= l < bucket + 10 or (bucket == 90 and l == 100)]
+        if ai_scores:
+            share = sum(a >= RELEVANCY_PERCENTAGE for a in ai_scores) / len(ai_scores)
+            print(f"  {bucket:>3}-{bucket + 9 if bucket < 90 else 100:<3}  {len(ai_scores):>6}  "
+                  f"{sum(ai_scores) / len(ai_scores):>13.0f}  {share:>11.0%}")
+
+    for threshold in reject_thresholds:
+        rejected = [r for l, r in zip(local, relevant) if l < threshold]
+        marker = " <- RELEVANCY_PREFILTER_REJECT" if threshold == RELEVANCY_PREFILTER_REJECT else ""
+        print(f"  reject < {threshold:>3}: {len(rejected) / len(pairs):.0%} of AI calls saved, "
+              f"{sum(rejected)} relevant jobs lost{marker}")
+    for threshold in pass_thresholds:
+        passed = [r for l, r in zip(local, relevant) if l >= threshold]
+        marker = " <- RELEVANCY_PREFILTER_PASS" if threshold == RELEVANCY_PREFILTER_PASS else ""
+        print(f"  pass >= {threshold:>3}: {len(passed) / len(pairs):.0%} of AI calls saved, "
+              f"{len(passed) - sum(passed)} not relevant jobs applied{marker}")
+
+
+if __name__ == "__main__":
+    from utils.application_ledger import iter_job_records
+
+    if len(sys.argv) > 1 and sys.argv[1] != "calibrate":
+        sys.exit("Usage: relevancy_prefilter.py calibrate")
+    calibrate(iter_job_records())
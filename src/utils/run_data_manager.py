@@ -1,34 +1,80 @@
 import datetime
 import json
+import threading
 
-from config import RUN_DATA_FILE, OPENAI_MODEL
+from config import RUN_DATA_FILE, OPENAI_MODEL, STORAGE_BACKEND
+from utils.sqlite_store import SqliteStore
 
 _run_data = {}
+_job_applications_index = {}  # search run id -> its job_applications entry
+_loaded = False  # loaded on first use, not at import
+_load_lock = threading.Lock()
+
+# SQLite backend: top-level run_data keys and job_applications entries live in their own namespaces
+_run_data_store = None
+_job_applications_store = None
+
+def _ensure_loaded():
+    global _loaded
+    if not _loaded:
+        with _load_lock:
+            if not _loaded:
+                _load_run_data()
+                _loaded = True
 
 def _load_run_data():
-    global _run_data
+    global _run_data, _run_data_store, _job_applications_store
+    if STORAGE_BACKEND == "sqlite":
+        _run_data_store = SqliteStore("run_data")
+        _job_applications_store = SqliteStore("job_applications")
+        _run_data = _run_data_store.load()
+        ja_list = list(_job_applications_store.load().values())
+        _run_data["job_applications"] = sorted(ja_list, key=lambda x: x.get("started_at", ""), reverse=True)[:10]
+        return
     try:
         with open(RUN_DATA_FILE, 'r') as f:
             _run_data = json.load(f)
 
+        # per-job history lives in the application ledger, run_data keeps the latest search run summaries
         ja_list = _run_data.get("job_applications")
         if isinstance(ja_list, list) and len(ja_list) > 10:
             _run_data["job_applications"] = ja_list[:10]
     except Exception as e:
         print(f"Could not load existing run_data.")
+    _job_applications_index.update((item["id"], item) for item in _run_data.get("job_applications", []))
 
 def get_run_data():
     """ Return the entire run_data dict. """
+    _ensure_loaded()
     return _run_data
 
 
 def save_run_data():
+    _ensure_loaded()
+    if _run_data_store:
+        with _run_data_store.transaction():
+            for key, value in _run_data.items():
+                if key != "job_applications":
+                    _run_data_store.set(key, value)
+        return
     try:
         with open(RUN_DATA_FILE, "w", encoding="utf-8") as f:
             json.dump(_run_data, f, indent=4)
     except Exception as e:
         print(f"Failed to save run data: {e}")
 
+def update_run_data(key, value):
+    """Set a top-level run_data key and persist it."""
+    _ensure_loaded()
+    try:
+        _run_data[key] = value
+        if _run_data_store:
+            _run_data_store.set(key, value)
+            return
+        save_run_data()
+    except Exception as e:
+        print(f"Failed to write run data: {e}")
+
 def update_run_data_udc(user_detail_chat_id, prop_key: str, value: dict):
     """
     Update run_data['user_detail_chat'] at the nested path specified by propKey.
@@ -36,59 +82,79 @@ def update_run_data_udc(user_detail_chat_id, prop_key: str, value: dict):
     Always updates user_detail_chat.chat_id and user_detail_chat.last_updated_at.
     """
     print("Updating run data for user detail chat...")
+    _ensure_loaded()
     try:
-        udc = _run_data.setdefault("user_detail_chat", {})
-        now_iso = datetime.datetime.now(datetime.timezone.utc).isoformat()
-        udc["chat_id"] = user_detail_chat_id
-        udc["modal"] = OPENAI_MODEL
-        udc["last_updated_at"] = now_iso
-        udc[prop_key] = value
+        if _run_data_store:
+            with _run_data_store.transaction():
+                udc = _run_data_store.get("user_detail_chat") or {}
+                _set_udc(udc, user_detail_chat_id, prop_key, value)
+                _run_data_store.set("user_detail_chat", udc)
+            _run_data["user_detail_chat"] = udc
+            return
 
+        udc = _run_data.setdefault("user_detail_chat", {})
+        _set_udc(udc, user_detail_chat_id, prop_key, value)
         save_run_data()
     except Exception as e:
         print(f"Failed to write run data: {e}")
 
+def _set_udc(udc, user_detail_chat_id, prop_key, value):
+    udc["chat_id"] = user_detail_chat_id
+    udc["modal"] = OPENAI_MODEL
+    udc["last_updated_at"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    udc[prop_key] = value
+
 def update_run_data_job_applications(id, keywords, location, last_page, applied=False, last_status=""):
     """
     Update run_data['job_applications'] entry for given id.
     If not found, create a new entry. Updates last_applied_at timestamp if applied is True.
     """
+    _ensure_loaded()
     try:
         ja_list = _run_data.setdefault("job_applications", [])
-        now_iso = datetime.datetime.now(datetime.timezone.utc).isoformat()
-        entry = next((item for item in ja_list if item["id"] == id), None)
+        if _job_applications_store:
+            with _job_applications_store.transaction():
+                entry = _job_applications_store.get(id) or _new_job_application(id, keywords, location, last_page)
+                _count_job_application(entry, last_page, applied, last_status)
+                _job_applications_store.set(id, entry)
+            ja_list[:] = [entry] + [item for item in ja_list if item["id"] != id]
+            return
+
+        entry = _job_applications_index.get(id)
         if not entry:
-            entry = {
-                "id": id,
-                "keywords": keywords,
-                "location": location,
-                "started_at": now_iso,
-                "last_page": last_page,
-                "total_applications": 0,
-                "applied": 0,
-                "skipped": 0
-            }
+            entry = _job_applications_index[id] = _new_job_application(id, keywords, location, last_page)
             ja_list.insert(0, entry)
-
-        entry["last_page"] = last_page
-        entry["total_applications"] += 1
-        if applied:
-            entry["applied"] += 1
-            entry["last_applied_at"] = now_iso
-        else:
-            entry["skipped"] += 1
-        
-        entry["last_status"] = last_status
-        if "Applied" in last_status:
-            entry["Applied already"] = entry.get("Applied already", 0) + 1
-        elif "Timeout" in last_status or "Error" in last_status:
-            entry["Error"] = entry.get("Error", 0) + 1
-        elif last_status:
-            entry[last_status] = entry.get(last_status, 0) + 1
-
+        _count_job_application(entry, last_page, applied, last_status)
         save_run_data()
     except Exception as e:
         print(f"Failed to write run data: {e}")
 
+def _new_job_application(id, keywords, location, last_page):
+    return {
+        "id": id,
+        "keywords": keywords,
+        "location": location,
+        "started_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "last_page": last_page,
+        "total_applications": 0,
+        "applied": 0,
+        "skipped": 0
+    }
+
+def _count_job_application(entry, last_page, applied, last_status):
+    now_iso = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    entry["last_page"] = last_page
+    entry["total_applications"] += 1
+    if applied:
+        entry["applied"] += 1
+        entry["last_applied_at"] = now_iso
+    else:
+        entry["skipped"] += 1
 
-_load_run_data()
\ No newline at end of file
+    entry["last_status"] = last_status
+    if "Applied" in last_status:
+        entry["Applied already"] = entry.get("Applied already", 0) + 1
+    elif "Timeout" in last_status or "Error" in last_status:
+        entry["Error"] = entry.get("Error", 0) + 1
+    elif last_status:
+        entry[last_status] = entry.get(last_status, 0) + 1
@@ -0,0 +1,77 @@
+"""Compact index of jobs already processed (job id -> last outcome and time), to skip them before clicking."""
+import time
+
+from config import SEEN_JOBS_FILE, SEEN_JOBS_LOG_FILE, SEEN_JOB_REVISIT_DAYS
+from utils.cache_manager import new_store
+
+_seen = None  # job id -> {"o": outcome, "t": epoch seconds}
+_store = None
+
+
+def _load():
+    global _seen, _store
+    _store = new_store("seen_jobs", SEEN_JOBS_FILE, SEEN_JOBS_LOG_FILE)
+    try:
+        _seen = _store.load()
+    except Exception as e:
+        print(f"Failed to load seen jobs: {e}")
+        _seen = {}
+    if _store.needs_compaction(len(_seen)):
+        _store.compact(_seen)
+
+
+def job_outcome(applied, status):
+    """Classify an apply_job result into an SEEN_JOB_REVISIT_DAYS outcome."""
+    status = (status or "").lower()
+    if applied or "applied" in status:
+        return "applied"
+    if "not relevant" in status:
+        return "not_relevant"
+    if "excluded" in status:
+        return "excluded"
+    if "no longer accepting" in status or "closed" in status:
+        return "closed"
+    if "missing job details" in status:
+        return "missing_details"
+    return "error"
+
+
+def mark_job_seen(job_id, applied, status):
+    if not job_id:
+        return
+    if _seen is None:
+        _load()
+    entry = {"o": job_outcome(applied, status), "t": int(time.time())}
+    _seen[str(job_id)] = entry
+    _store.set(str(job_id), entry)
+    _store.flush()
+    if _store.needs_compaction(len(_seen)):
+        _store.compact(_seen)
+
+
+def was_job_seen(job_id):
+    """Whether the job was processed before, whatever its outcome and however long ago."""
+    if not job_id:
+        return False
+    if _seen is None:
+        _load()
+    return str(job_id) in _seen
+
+
+def should_skip_job(job_id):
+    """
+    Return the outcome to skip the job for, or None to process it: it was seen and its
+    outcome's revisit window (None = never revisit) has not passed yet.
+    """
+    if not job_id:
+        return None
+    if _seen is None:
+        _load()
+    entry = _seen.get(str(job_id))
+    if not entry:
+        return None
+    outcome = entry.get("o", "error")
+    revisit_days = SEEN_JOB_REVISIT_DAYS.get(outcome, 0)
+    if revisit_days is None or time.time() - entry.get("t", 0) < revisit_days * 86400:
+        return outcome
+    return None
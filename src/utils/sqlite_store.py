@@ -0,0 +1,118 @@
+"""SQLite (WAL) key/value store shared by concurrent applier processes."""
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from config import SQLITE_DB_FILE
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    namespace  TEXT NOT NULL,
+    key        TEXT NOT NULL,
+    value      TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+)
+"""
+
+
+def connect(db_file=SQLITE_DB_FILE):
+    """Open a connection in WAL mode: concurrent readers, one writer at a time, waits instead of failing."""
+    os.makedirs(os.path.dirname(str(db_file)) or ".", exist_ok=True)
+    conn = sqlite3.connect(str(db_file), timeout=30, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+    conn.execute(_SCHEMA)
+    return conn
+
+
+class SqliteStore:
+    """
+    One namespace of the shared kv table, with the same interface as LogStore.
+
+    Every write is an upsert committed on its own unless wrapped in transaction(),
+    which takes the write lock up front so read-modify-write updates from several
+    processes never interleave.
+    """
+
+    shared = True
+
+    def __init__(self, namespace, db_file=SQLITE_DB_FILE):
+        self.namespace = namespace
+        self._conn = connect(db_file)
+        self._lock = threading.RLock()
+        self._txn_depth = 0
+
+    def load(self):
+        """Return {key: value} for every row of the namespace, oldest write first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value FROM kv WHERE namespace = ? ORDER BY updated_at",
+                (self.namespace,)).fetchall()
+        return {k: json.loads(v) for k, v in rows}
+
+    def rows(self):
+        """Return [(key, value, updated_at)] for the namespace, oldest write first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value, updated_at FROM kv WHERE namespace = ? ORDER BY updated_at",
+                (self.namespace,)).fetchall()
+        return [(k, json.loads(v), t) for k, v, t in rows]
+
+    def get(self, key, default=None):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM kv WHERE namespace = ? AND key = ?",
+                (self.namespace, key)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set(self, key, value):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO kv (namespace, key, value, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+                (self.namespace, key, json.dumps(value, ensure_ascii=False), time.time()))
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM kv WHERE namespace = ? AND key = ?", (self.namespace, key))
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Group reads and writes atomically across processes (BEGIN IMMEDIATE)."""
+        with self._lock:
+            outermost = self._txn_depth == 0
+            if outermost:
+                self._conn.execute("BEGIN IMMEDIATE")
+            self._txn_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._txn_depth -= 1
+                if outermost:
+                    self._conn.execute("ROLLBACK")
+                raise
+            self._txn_depth -= 1
+            if outermost:
+                self._conn.execute("COMMIT")
+
+    def needs_compaction(self, live_count):
+        return False
+
+    def compact(self, data):
+        """Replace the namespace contents with data in one transaction."""
+        with self.transaction():
+            self._conn.execute("DELETE FROM kv WHERE namespace = ?", (self.namespace,))
+            for key, value in data.items():
+                self.set(key, value)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
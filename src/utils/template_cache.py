@@ -0,0 +1,123 @@
+"""Long-form answers reused across similar jobs as templates with company/title/recruiter slots."""
+import re
+
+from config import TEMPLATE_CACHE_ENABLED, TEMPLATE_MAX_USES, TEMPLATE_MIN_MATCH_OVERLAP
+from utils.cache_manager import get_from_cache, set_to_cache
+from utils.option_matcher import normalize_option
+
+_SENIORITY = re.compile(r"\b(?:senior|sr|junior|jr|lead|principal|staff|associate|intern|mid|entry|level"
+                        r"|i{1,3}|iv|[1-5])\b")
+_ROLE_SYNONYMS = {"developer": "engineer", "dev": "engineer", "programmer": "engineer", "swe": "software engineer"}
+_STOP_WORDS = {"and", "the", "with", "for", "in", "of", "on", "to", "a", "an", "experience", "years", "strong"}
+_MIN_SLOT_LENGTH = 4
+
+# Current job: {"cluster", "company", "title", "match": {keywords}}
+_job = {}
+
+
+def job_cluster(title):
+    """Normalized role of a job title: "Senior Java Developer - Remote" -> "java engineer"."""
+    text = re.split(r"\s+(?:-|–|\||@|at)\s+", (title or "").lower())[0]
+    text = normalize_option(re.sub(r"\(.*?\)|\[.*?\]", " ", text))
+    text = re.sub(r"\bback end\b", "backend", re.sub(r"\bfront end\b", "frontend", text))
+    words = [_ROLE_SYNONYMS.get(w, w) for w in _SENIORITY.sub(" ", text).split()]
+    return " ".join(words)
+
+
+def _keywords(text):
+    return {w for w in normalize_option(text or "").split() if len(w) > 1 and w not in _STOP_WORDS}
+
+
+def set_current_job(job_details, relevancy_status=None):
+    """Set the job the next long-form answers are for."""
+    _job.clear()
+    title = job_details.get("title") or ""
+    _job.update({
+        "cluster": job_cluster(title),
+        "company": (job_details.get("company") or "").strip(),
+        "title": title.strip(),
+        "match": _keywords((relevancy_status or {}).get("match")),
+    })
+
+
+def _slots(recruiter_name):
+    slots = {"company": _job.get("company"), "title": _job.get("title")}
+    if recruiter_name and recruiter_name.strip():
+        slots["recruiter_name"] = recruiter_name.strip()
+        slots["recruiter_first_name"] = recruiter_name.split()[0]
+    return {k: v for k, v in slots.items() if v}
+
+
+def _map_text(answer, fn):
+    if isinstance(answer, dict):
+        return {k: fn(v) if isinstance(v, str) else v for k, v in answer.items()}
+    return fn(answer)
+
+
+def _templatize(answer, slots):
+    """
+    Replace this job's company, title and recruiter name with {slot} placeholders, longest value first.
+    Matching is case-sensitive so "Apple" does not capture "apple"; returns None if a value shorter than
+    _MIN_SLOT_LENGTH ("Box") appears in the answer, as it cannot be told apart from ordinary words.
+    """
+    unsafe = []
+
+    def replace(text):
+        for slot, value in sorted(slots.items(), key=lambda x: -len(x[1])):
+            pattern = rf"(?<!\w){re.escape(value)}(?!\w)"
+            if len(value) < _MIN_SLOT_LENGTH:
+                if re.search(pattern, text):
+                    unsafe.append(slot)
+                continue
+            text = re.sub(pattern, "{" + slot + "}", text)
+        return text
+    template = _map_text(answer, replace)
+    return None if unsafe else template
+
+
+def _fill(template, slots):
+    """Fill the placeholders, or return None if the template needs a slot this job does not have."""
+    missing = []
+
+    def fill(text):
+        for slot in re.findall(r"\{(company|title|recruiter_name|recruiter_first_name)\}", text):
+            if slot in slots:
+                text = text.replace("{" + slot + "}", slots[slot])
+            else:
+                missing.append(slot)
+        return text
+    answer = _map_text(template, fill)
+    return None if missing else answer
+
+
+def _is_stale(entry):
+    if TEMPLATE_MAX_USES and entry.get("uses", 0) >= TEMPLATE_MAX_USES:
+        return True
+    match, template_match = _job.get("match"), set(entry.get("match") or ())
+    if TEMPLATE_MIN_MATCH_OVERLAP and match and template_match:
+        return len(match & template_match) / len(match | template_match) < TEMPLATE_MIN_MATCH_OVERLAP
+    return False
+
+
+def get_from_template(kind, generate, recruiter_name=None):
+    """
+    Return a long-form answer of this kind for the current job: filled in from the template of a similar
+    job if there is a fresh one, otherwise generate() it (str, or dict of str) and keep it as the new template.
+    """
+    if not TEMPLATE_CACHE_ENABLED or not _job.get("cluster"):
+        return generate()
+    key = f"template::{kind} @ {_job['cluster']}"
+    slots = _slots(recruiter_name)
+    entry = get_from_cache(key)
+    if isinstance(entry, dict) and not _is_stale(entry):
+        answer = _fill(entry.get("template"), slots)
+        if answer:
+            print(f"Template hit for {kind} ({_job['cluster']})")
+            set_to_cache(key, dict(entry, uses=entry.get("uses", 0) + 1))
+            return answer
+
+    answer = generate()
+    template = _templatize(answer, slots) if answer and answer != "''" else None
+    if template:
+        set_to_cache(key, {"template": template, "uses": 1, "match": sorted(_job.get("match", ()))})
+    return answer
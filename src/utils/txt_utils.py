@@ -1,16 +1,9 @@
-import os
-
 def append_txt_records(file_path: str, lines):
     if isinstance(lines, str):
         lines = [lines]
 
-    if not os.path.exists(file_path):
-        with open(file_path, "w", encoding="utf-8") as f:
-            pass
-
     with open(file_path, "a", encoding="utf-8") as f:
-        for line in lines:
-            f.write(f"\n{line}")
+        f.write("".join(f"\n{line}" for line in lines))
 
 
 def remove_line_from(file_path: str, line_to_remove: str):
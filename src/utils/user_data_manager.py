@@ -1,23 +1,47 @@
 import os
+import threading
 
-from config import QNA_LIST_FILE, RESUME_FOLDER, OPENAI_MODEL, INSTRUCTIONS_FILE
+from config import QNA_LIST_FILE, RESUME_FOLDER, OPENAI_MODEL, INSTRUCTIONS_FILE, STORAGE_BACKEND
 from utils.cache_manager import remove_by_ques_from_cache, get_full_qna_cache
-from utils.common_utils import last_modified_iso
-from utils.run_data_manager import get_run_data
+from utils.common_utils import file_sha256, last_modified_iso
+from utils.question_normalizer import canonical_question
+from utils.run_data_manager import get_run_data, update_run_data
+from utils.sqlite_store import SqliteStore
+from utils.write_behind import write_file
 
 QNA_LIST_HEADER_LINES = 5
 INSTRUCTIONS_HEADER_LINES = 5
+RESUME_UPLOADS_KEPT = 5
 
 _qna_list_header = []
-_qna_list = {}
+_qna_list = {}  # oldest answer first, so recording an answer is a move to the end; the file lists newest first
 
 _instructions_list_header = []
 _instructions_list = []
 
+# SQLite backend: shared qna store, qna_list.txt is rendered from it
+_qna_store = None
+
+_loaded = False  # qna_list and instructions are read on first use, not at import
+_load_lock = threading.Lock()
+
+def _ensure_loaded():
+    global _loaded
+    if not _loaded:
+        with _load_lock:
+            if not _loaded:
+                _load_qna_list_data()
+                _loaded = True
+
 def _load_qna_list_data():
     global _qna_list
     global _qna_list_header
-    _qna_list_header, _qna_list = read_qna_list_qnas()
+    global _qna_store
+    _qna_list_header, file_qnas = read_qna_list_qnas()
+    _qna_list = dict(reversed(list(file_qnas.items())))
+    if STORAGE_BACKEND == "sqlite":
+        _qna_store = SqliteStore("qna_list")
+        _qna_list = _merge_qna_list_store(_qna_list)
     global _instructions_list_header
     global _instructions_list
     _instructions_list_header, _instructions_list = read_header_file(INSTRUCTIONS_FILE,
@@ -83,61 +107,99 @@ def split_qna(line):
     return line, ""
 
 
+def _merge_qna_list_store(file_qnas):
+    """
+    Merge qna_list.txt edits into the shared store and return the merged qnas, oldest first.
+    Stored questions missing from the file are dropped only if they predate the file,
+    otherwise another process added them after the file was last rendered.
+    """
+    file_mtime = os.path.getmtime(QNA_LIST_FILE) if os.path.exists(QNA_LIST_FILE) else 0
+    with _qna_store.transaction():
+        for q, a, updated_at in _qna_store.rows():
+            if q not in file_qnas and updated_at < file_mtime:
+                _qna_store.delete(q)
+            elif q in file_qnas and file_qnas[q] == a:
+                file_qnas.pop(q)
+        for q, a in file_qnas.items():
+            _qna_store.set(q, a)
+        return _qna_store.load()
+
+
 def get_changed_qna_list(user_detail_chat, is_new_conv=False):
     """ Return questions from qna_list that need updates. """
     print("Checking for changed qna_list qnas...")
+    _ensure_loaded()
     qna_list_meta = user_detail_chat.get("qna_list", {})
-    current_last_modified = last_modified_iso(QNA_LIST_FILE)
-    if not is_new_conv and qna_list_meta.get("last_modified") == current_last_modified:
+    if not is_new_conv and qna_list_meta.get("sha256") == file_sha256(QNA_LIST_FILE):
         return []
     
     changed = {}
     qna_cache = get_full_qna_cache()
     for user_q, user_a in _qna_list.items():
-        cache_a = qna_cache.get(user_q)
+        canonical_q = canonical_question(user_q)
+        cache_a = qna_cache.get(canonical_q, qna_cache.get(user_q))
         if user_a and (is_new_conv or user_a != cache_a):
             changed[user_q] = user_a
+            remove_by_ques_from_cache(canonical_q)
             remove_by_ques_from_cache(user_q)
     
     return changed
 
 
+def get_qna_list():
+    """Return the {question: answer} qna list. Treat as read-only."""
+    _ensure_loaded()
+    return _qna_list
+
+
 def get_ai_instructions_data():
+    _ensure_loaded()
     return _instructions_list
 
 
 def clear_ai_instructions_data():
     global _instructions_list
+    _ensure_loaded()
     _instructions_list = []
-    with open(INSTRUCTIONS_FILE, "w", encoding="utf-8") as f:
-        for line in _instructions_list_header:
-            f.write(line)
+    header = "".join(_instructions_list_header)
+    write_file(INSTRUCTIONS_FILE, lambda: header)
 
 
 def remove_from_qna_list(trained_qnas):
+    _ensure_loaded()
+    if _qna_store:
+        with _qna_store.transaction():
+            for q in trained_qnas:
+                _qna_store.delete(q)
     for q in trained_qnas:
         if q in _qna_list:
             del _qna_list[q]
     save_qna_list()
 
 
-def save_qna_list():
-    with open(QNA_LIST_FILE, "w", encoding="utf-8") as f:
-        for line in _qna_list_header:
-            f.write(line)
+def _render_qna_list():
+    # the SQLite store is shared: render every process's answers, or the next start's merge would take the ones
+    # missing from this process's list for user deletions
+    items = list((_qna_store.load() if _qna_store else _qna_list).items())[::-1]  # snapshot, the list may change
+    sorted_items = sorted(items, key=lambda x: x[1] != "")
+    return "".join(_qna_list_header) + "".join(f"{k}: {v}\n" for k, v in sorted_items)
 
-        sorted_items = sorted(_qna_list.items(), key=lambda x: x[1] != "")
-        sorted_dict = dict(sorted_items)
-        for k, v in sorted_dict.items():
-            f.write(f"{k}: {v}\n")
+
+def save_qna_list():
+    """Queue a rewrite of qna_list.txt (unanswered questions first); written in the background."""
+    _ensure_loaded()
+    write_file(QNA_LIST_FILE, _render_qna_list)
 
 def append_qna_list(question, answer):
-    global _qna_list
+    _ensure_loaded()
+    if _qna_store:
+        _qna_store.set(question, answer)
     _qna_list.pop(question, None)
-    _qna_list = {question: answer} | _qna_list
-    save_qna_list()
+    _qna_list[question] = answer
+    save_qna_list()  # coalesced: the file is rendered once per write-behind interval, not per answer
 
-def is_new_resume(resume_file_path):
+def is_new_resume(resume_file_path, resume_sha=None):
+    """Whether the resume content (or the AI model) differs from the one the user detail chat was started with."""
     print("Checking if resume file is new or changed...")
     run_data = get_run_data()
     user_detail_chat = run_data.get("user_detail_chat")
@@ -149,11 +211,29 @@ def is_new_resume(resume_file_path):
     resume_meta = user_detail_chat.get("resume", {})
     if not resume_meta or not isinstance(resume_meta, dict):
         return True
+    if ai_modal != OPENAI_MODEL:
+        return True
 
-    chat_file_path = resume_meta.get("file_path")
-    last_modified = resume_meta.get("last_modified")
-    current_last_modified = last_modified_iso(resume_file_path)
-    return ai_modal != OPENAI_MODEL or chat_file_path != resume_file_path or last_modified != current_last_modified
+    if "sha256" not in resume_meta:
+        # recorded before content hashes: trust the old path + mtime check once
+        return (resume_meta.get("file_path") != resume_file_path
+                or resume_meta.get("last_modified") != last_modified_iso(resume_file_path))
+    return resume_meta["sha256"] != (resume_sha or file_sha256(resume_file_path))
+
+def get_resume_upload(resume_sha):
+    """The {"file_id", "chat_id", "resume"} recorded when this resume content was uploaded with OPENAI_MODEL."""
+    upload = get_run_data().get("resume_uploads", {}).get(resume_sha)
+    if upload and upload.get("modal") == OPENAI_MODEL:
+        return upload
+    return None
+
+def record_resume_upload(resume_sha, chat_id, resume_meta):
+    """Remember the uploaded file and latest user detail chat of a resume content, for the last few resumes."""
+    uploads = dict(get_run_data().get("resume_uploads", {}))
+    uploads.pop(resume_sha, None)
+    uploads[resume_sha] = {"modal": OPENAI_MODEL, "file_id": resume_meta.get("file_id"), "chat_id": chat_id,
+                           "resume": resume_meta}
+    update_run_data("resume_uploads", dict(list(uploads.items())[-RESUME_UPLOADS_KEPT:]))
 
 def get_resume_file():
     if not os.path.exists(RESUME_FOLDER):
@@ -170,5 +250,3 @@ def get_resume_file():
 
     return os.path.join(RESUME_FOLDER, resume_files[0])
 
-
-_load_qna_list_data()
@@ -0,0 +1,79 @@
+"""
+Write-behind persistence for user-facing text files (qna_list, instructions, trained-data).
+Rewrites and appends are queued and coalesced, then written by a background thread every
+WRITE_BEHIND_INTERVAL seconds, at job boundaries (flush_writes) and at exit.
+"""
+import atexit
+import os
+import threading
+import time
+
+from config import WRITE_BEHIND_INTERVAL
+from utils.txt_utils import append_txt_records
+
+_pending_writes = {}  # path -> render() returning the full file content; the latest one wins
+_pending_appends = {}  # path -> [line, ...]
+_lock = threading.Lock()
+_flush_lock = threading.Lock()
+_thread = None
+
+
+def _write_atomic(path, content):
+    tmp_file = f"{path}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_file, path)
+
+
+def flush_writes():
+    """Write everything queued so far."""
+    with _flush_lock:
+        with _lock:
+            writes, appends = dict(_pending_writes), dict(_pending_appends)
+            _pending_writes.clear()
+            _pending_appends.clear()
+        for path, render in writes.items():
+            try:
+                _write_atomic(path, render())
+            except Exception as e:
+                print(f"Failed to write {path}: {e}")
+        for path, lines in appends.items():
+            try:
+                append_txt_records(path, lines)
+            except Exception as e:
+                print(f"Failed to append to {path}: {e}")
+
+
+def _run():
+    while True:
+        time.sleep(WRITE_BEHIND_INTERVAL)
+        flush_writes()
+
+
+def _schedule():
+    global _thread
+    if not WRITE_BEHIND_INTERVAL:
+        flush_writes()
+        return
+    if _thread is None:
+        _thread = threading.Thread(target=_run, name="write-behind", daemon=True)
+        _thread.start()
+
+
+def write_file(path, render):
+    """Queue a full rewrite of path; render() is called at flush time and must return the content."""
+    with _lock:
+        _pending_writes[path] = render
+    _schedule()
+
+
+def append_lines(path, lines):
+    """Queue lines to append to path."""
+    if isinstance(lines, str):
+        lines = [lines]
+    with _lock:
+        _pending_appends.setdefault(path, []).extend(lines)
+    _schedule()
+
+
+atexit.register(flush_writes)
@@ -0,0 +1,37 @@
+import pytest
+
+from utils import answer_rules, candidate_profile
+
+PROFILE = {
+    "work_authorization": {"authorized_countries": ["Singapore"], "unauthorized_countries": ["United States"],
+                           "requires_sponsorship": False},
+    "contacts": {"linkedin": "https://www.linkedin.com/in/me", "github": "https://github.com/me"},
+}
+
+
+@pytest.fixture(autouse=True)
+def profile(monkeypatch):
+    monkeypatch.setattr(candidate_profile, "_profile", {"profile": PROFILE})
+
+
+@pytest.mark.parametrize("question, expected", [
+    ("Will you now or in the future require visa sponsorship to work in the United States?", None),
+    ("Do you require sponsorship to work in Germany?", None),
+    ("Do you require sponsorship to work in Singapore?", "No"),
+    ("Will you now or in the future require sponsorship for employment visa status?", "No"),
+    ("Are you legally authorized to work in Singapore?", "Yes"),
+    ("Are you authorized to work in the United States?", "No"),
+    ("Are you authorized to work in Canada?", None),
+])
+def test_work_authorization_follows_the_named_country(question, expected):
+    assert answer_rules.answer_from_profile(question) == expected
+
+
+@pytest.mark.parametrize("question, expected", [
+    ("LinkedIn Profile URL", "https://www.linkedin.com/in/me"),
+    ("What is your GitHub profile?", "https://github.com/me"),
+    ("How did you hear about this job (LinkedIn, Indeed, other)?", None),
+    ("Do you have experience with GitHub Actions?", None),
+])
+def test_profile_links_only_answer_link_questions(question, expected):
+    assert answer_rules.answer_from_profile(question) == expected
@@ -0,0 +1,27 @@
+from utils.application_ledger import JsonlLedger
+
+
+def test_find_across_rotated_parts(tmp_path):
+    ledger = JsonlLedger(tmp_path / "ledger.jsonl")
+    ledger._writer.max_bytes = 60
+    for i in range(12):
+        ledger.append({"job_id": str(i % 3), "n": i})
+    assert len(list(tmp_path.glob("ledger.*.jsonl.gz"))) > 1
+    assert [r["n"] for r in ledger.find("1")] == [1, 4, 7, 10]
+
+    # the index built by find is kept up to date by appends, also across a rotation
+    for i in range(12, 18):
+        ledger.append({"job_id": str(i % 3), "n": i})
+        assert ledger.find(str(i % 3))[-1]["n"] == i
+    assert [r["n"] for r in ledger.find("2")] == [2, 5, 8, 11, 14, 17]
+    assert [r["n"] for r in JsonlLedger(tmp_path / "ledger.jsonl").find("0")] == [0, 3, 6, 9, 12, 15]
+    assert ledger.find("missing") == []
+
+
+def test_find_after_torn_write(tmp_path):
+    path = tmp_path / "ledger.jsonl"
+    path.write_text('{"job_id": "1", "n": 0}\n{"job_id": "1", "n"', encoding="utf-8")
+    ledger = JsonlLedger(path)
+    assert [r["n"] for r in ledger.find("1")] == [0]
+    ledger.append({"job_id": "1", "n": 1})
+    assert [r["n"] for r in ledger.find("1")] == [0, 1]
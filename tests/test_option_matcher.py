@@ -0,0 +1,43 @@
+import pytest
+
+from utils.option_matcher import match_option
+
+
+@pytest.mark.parametrize("answer, opposite", [
+    ("Do not require sponsorship", "Require sponsorship"),
+    ("I don't require sponsorship", "Require sponsorship"),
+    ("Not authorized", "Authorized"),
+    ("Not applicable", "Applicable"),
+    ("Unavailable", "Available"),
+    ("Available", "Unavailable"),
+    ("Require sponsorship", "Do not require sponsorship"),
+])
+def test_negated_answer_never_matches_the_opposite_option(answer, opposite):
+    assert match_option(answer, [opposite, "Prefer not to say"]) != opposite
+
+
+@pytest.mark.parametrize("answer, labels, expected", [
+    ("Do not require sponsorship", ["Require sponsorship", "Do not require sponsorship"],
+     "Do not require sponsorship"),
+    ("Not authorised", ["Authorized", "Not authorized"], "Not authorized"),
+    ("Not authorized", ["Authorized", "Unauthorized"], "Unauthorized"),
+    ("Unavailable", ["Available", "Unavailable"], "Unavailable"),
+])
+def test_negated_answer_matches_the_negated_option(answer, labels, expected):
+    assert match_option(answer, labels) == expected
+
+
+@pytest.mark.parametrize("answer, expected", [
+    ("Yes, I am", "Yes"),
+    ("Yes - authorized to work", "Yes"),
+    ("No, I will require sponsorship", "No"),
+    ("I do not", "No"),
+])
+def test_leading_yes_no(answer, expected):
+    assert match_option(answer, ["Yes", "No"]) == expected
+
+
+def test_yes_no_option_labels_with_explanation():
+    labels = ["Yes, I am legally authorized", "No, I am not authorized"]
+    assert match_option("Yes", labels) == labels[0]
+    assert match_option("No", labels) == labels[1]
@@ -0,0 +1,23 @@
+import pytest
+
+from utils.question_normalizer import canonical_question
+
+
+@pytest.mark.parametrize("first, second", [
+    ("What state do you live in?", "What do you live in?"),
+    ("Mention your notice period", "Your notice period"),
+    ("Phone number (optional)", "Phone number"),
+    ("Is a cover letter required?", "Is a cover letter optional?"),
+    ("Please state your expected salary", "Your expected salary"),
+])
+def test_distinct_questions_do_not_collide(first, second):
+    assert canonical_question(first) != canonical_question(second)
+
+
+@pytest.mark.parametrize("first, second", [
+    ("Please enter your mobile phone number", "Phone number"),
+    ("Provide your email address", "What is your email address?"),
+    ("How many years of work experience do you have with React.js?", "Years of experience with ReactJS"),
+])
+def test_wording_variants_collapse(first, second):
+    assert canonical_question(first) == canonical_question(second)